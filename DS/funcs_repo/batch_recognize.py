@@ -0,0 +1,234 @@
+"""
+Пакетне розпізнавання номерних знаків на архіві фотографій.
+
+Файли розподіляються між процесами пулу, а результати записуються у JSONL
+(один рядок на файл: file, plate, confidence, timings у мілісекундах, а з --all-plates ще й plates -
+усі номерні знаки кадру) одразу після завершення кожного файлу. Вихідний файл одночасно є контрольною точкою: під час повторного
+запуску файли, які вже є у ньому, пропускаються без читання.
+
+Запуск з кореня репозиторію:
+    python -m DS.funcs_repo.batch_recognize DS/img --output DS/results/results.jsonl
+    python -m DS.funcs_repo.batch_recognize archive.zip --output results.jsonl --images-dir DS/results --workers 8
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from .camera_profiles import DEFAULT_PROFILE, CameraProfile, load_profiles
+from .configures import (INFERENCE_BACKEND, RECOGNITION_MODE, CAMERA_PROFILES, OUTPUT_FORMAT, OUTPUT_QUALITY,
+                         OUTPUT_MAX_SIZE)
+from .datasets import iter_plate_images
+from .image_output import DEFAULT_OUTPUT, OutputOptions
+from .parallel import imap_unordered
+
+
+def _init_worker(backend: str):
+    from .model_registry import registry
+
+    registry.configure(backend=backend)
+    registry.warm_up()
+
+
+def result_image_name(file_name: str, plate: str = None, extension: str = OUTPUT_FORMAT) -> str:
+    """
+    Унікальна назва анотованого зображення.
+
+    Назва будується з відносного шляху вихідного файлу і розпізнаного номера,
+    тож однакові номери на різних фотографіях не перезаписують одне одного.
+
+    Параметри:
+    file_name (str): Відносний шлях вихідного файлу.
+    plate (str, optional): Розпізнаний номер.
+    extension (str): Формат зображення.
+
+    Повертає:
+    str: Назва файлу, наприклад 'gate1__0001_KA7777CA.jpg'.
+    """
+    stem = os.path.splitext(file_name.replace('\\', '/'))[0].replace('/', '__')
+    return f'{stem}_{plate or "unrecognized"}.{extension}'
+
+
+def _recognize_file(item, images_dir: str = None, mode: str = RECOGNITION_MODE,
+                    profile: CameraProfile = DEFAULT_PROFILE, image_output: OutputOptions = DEFAULT_OUTPUT,
+                    all_plates: bool = False) -> dict:
+    """
+    Розпізнає номер на одному файлі у робочому процесі.
+
+    Параметри:
+    item (tuple): Назва файлу та його вміст.
+    images_dir (str, optional): Каталог для анотованих зображень.
+    mode (str): Режим розпізнавання ('single' або 'tiered').
+    profile (CameraProfile): Профіль камери, що зробила фотографії.
+    image_output (OutputOptions): Формат, якість і розмір анотованих зображень.
+    all_plates (bool): Розпізнати всі номерні знаки кадру (image_process.recognize_plates) замість
+                       одного; plate і confidence - найкраще прочитання.
+
+    Повертає:
+    dict: Рядок результату для JSONL.
+    """
+    from .image_process import recognize_plate, recognize_plates
+
+    name, data = item
+    timings = {}
+    result = {'file': name, 'plate': None, 'confidence': None, 'timings': timings}
+    try:
+        if all_plates:
+            img_bytes, plates = recognize_plates(data, timings=timings, profile=profile, output=image_output)
+            result['plates'] = [{'plate': read['plate'], 'box': list(read['box']),
+                                 'confidence': None if read['confidence'] is None else round(read['confidence'], 4)}
+                                for read in plates]
+            result['plate'], confidence = (plates[0]['plate'], plates[0]['confidence']) if plates else (None, None)
+        else:
+            img_bytes, result['plate'], confidence = recognize_plate(data, timings=timings, mode=mode,
+                                                                     profile=profile, output=image_output)
+    except ValueError as e:
+        result['error'] = str(e)
+        return result
+    if confidence is not None:
+        result['confidence'] = round(confidence, 4)
+    for stage, seconds in timings.items():
+        timings[stage] = round(seconds * 1000, 3)
+    if images_dir:
+        # Зображення записується у робочому процесі, щоб не передавати його через IPC
+        with open(os.path.join(images_dir, result_image_name(name, result['plate'], image_output.format)), 'wb') as file:
+            file.write(img_bytes)
+    return result
+
+
+def load_checkpoint(path: str) -> set:
+    """
+    Назви файлів, які вже оброблені у попередніх запусках.
+
+    Незавершений останній рядок (якщо процес було перервано під час запису)
+    ігнорується, і такий файл буде оброблено повторно.
+
+    Параметри:
+    path (str): Вихідний JSONL-файл.
+
+    Повертає:
+    set: Назви оброблених файлів.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            try:
+                done.add(json.loads(line)['file'])
+            except (ValueError, KeyError):
+                continue
+    return done
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, 'rb') as file:
+        file.seek(-1, os.SEEK_END)
+        return file.read(1) == b'\n'
+
+
+def recognize_batch(source: str, output: str, workers: int, backend: str = INFERENCE_BACKEND,
+                    images_dir: str = None, resume: bool = True, mode: str = RECOGNITION_MODE,
+                    profile: CameraProfile = DEFAULT_PROFILE, image_output: OutputOptions = DEFAULT_OUTPUT,
+                    all_plates: bool = False) -> dict:
+    """
+    Розпізнає всі зображення з каталогу або zip-архіву.
+
+    Параметри:
+    source (str): Каталог або zip-архів фотографій.
+    output (str): Вихідний JSONL-файл (і контрольна точка).
+    workers (int): Кількість робочих процесів; 0 - виконання у поточному процесі.
+    backend (str): Середовище виконання класифікатора.
+    images_dir (str, optional): Каталог для анотованих зображень.
+    resume (bool): Пропускати файли, які вже є у вихідному файлі.
+    mode (str): Режим розпізнавання ('single' або 'tiered').
+    profile (CameraProfile): Профіль камери, що зробила фотографії.
+    image_output (OutputOptions): Формат, якість і розмір анотованих зображень.
+    all_plates (bool): Записувати всі номерні знаки кожного кадру (для камер, що охоплюють кілька смуг).
+
+    Повертає:
+    dict: Кількість оброблених, розпізнаних, пропущених файлів і помилок.
+    """
+    done = load_checkpoint(output) if resume else set()
+    if images_dir:
+        os.makedirs(images_dir, exist_ok=True)
+    output_dir = os.path.dirname(output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    items = iter_plate_images(source, exclude=done)
+    task = partial(_recognize_file, images_dir=images_dir, mode=mode, profile=profile,
+                   image_output=image_output, all_plates=all_plates)
+    pool = None
+    if workers > 0:
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_init_worker, initargs=(backend,))
+        results = imap_unordered(pool, task, items, max_pending=workers * 4)
+    else:
+        _init_worker(backend)
+        results = map(task, items)
+
+    summary = {'processed': 0, 'recognized': 0, 'errors': 0, 'skipped': len(done)}
+    start = time.perf_counter()
+    try:
+        with open(output, 'a' if resume else 'w', encoding='utf-8') as file:
+            if file.tell() and not _ends_with_newline(output):
+                # Завершення рядка, обірваного під час попереднього запуску
+                file.write('\n')
+            for result in results:
+                file.write(json.dumps(result, ensure_ascii=False) + '\n')
+                file.flush()
+                summary['processed'] += 1
+                summary['recognized'] += bool(result['plate'])
+                summary['errors'] += 'error' in result
+                if summary['processed'] % 100 == 0:
+                    rate = summary['processed'] / (time.perf_counter() - start)
+                    print(f"Оброблено {summary['processed']} файлів ({rate:.1f}/с)", file=sys.stderr)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    summary['seconds'] = round(time.perf_counter() - start, 3)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Пакетне розпізнавання номерних знаків.')
+    parser.add_argument('source', help='Каталог або zip-архів фотографій')
+    parser.add_argument('--output', default='DS/results/results.jsonl', help='Вихідний JSONL-файл')
+    parser.add_argument('--images-dir', help='Каталог для анотованих зображень')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='Кількість робочих процесів (0 - у поточному процесі)')
+    parser.add_argument('--backend', default=INFERENCE_BACKEND, help='keras, tflite або onnx')
+    parser.add_argument('--mode', default=RECOGNITION_MODE, help='single або tiered')
+    parser.add_argument('--format', default=OUTPUT_FORMAT, help='Формат анотованих зображень: jpg, webp або png')
+    parser.add_argument('--quality', type=int, default=OUTPUT_QUALITY, help='Якість JPEG / WebP (1-100)')
+    parser.add_argument('--max-size', type=int, default=OUTPUT_MAX_SIZE,
+                        help='Найбільша сторона анотованого зображення (0 - повна роздільність)')
+    parser.add_argument('--crop', action='store_true', help='Зберігати лише область номерного знаку')
+    parser.add_argument('--camera', default='default', help='Ідентифікатор камери у файлі профілів')
+    parser.add_argument('--profiles', default=CAMERA_PROFILES, help='Файл профілів камер')
+    parser.add_argument('--all-plates', action='store_true',
+                        help='Записувати всі номерні знаки кадру (режим --mode не використовується)')
+    parser.add_argument('--no-resume', action='store_true', help='Перезаписати вихідний файл')
+    args = parser.parse_args(argv)
+
+    profiles = load_profiles(args.profiles)
+    if args.camera not in profiles:
+        parser.error(f'Невідома камера: {args.camera}')
+    try:
+        image_output = OutputOptions(args.format, args.quality, args.max_size or None, args.crop)
+    except ValueError as e:
+        parser.error(str(e))
+    summary = recognize_batch(args.source, args.output, args.workers, backend=args.backend,
+                              images_dir=args.images_dir, resume=not args.no_resume,
+                              mode=args.mode, profile=profiles[args.camera], image_output=image_output,
+                              all_plates=args.all_plates)
+    print(json.dumps(summary, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
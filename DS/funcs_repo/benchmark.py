@@ -0,0 +1,302 @@
+"""
+Бенчмарк конвеєра розпізнавання номерних знаків.
+
+Вимірює затримку кожного етапу (p50/p95/p99), пропускну здатність за вибраної
+кількості процесів, пікове використання пам'яті (RSS) та точність на рівні
+номерних знаків і окремих символів. Звіт зберігається у JSON і може
+порівнюватися зі збереженим базовим звітом.
+
+Джерела даних:
+- розмічені символи з DS/data.zip - точність і затримка класифікатора;
+- каталог або zip-архів фотографій, назва кожного файлу - правильний номер
+  ('KA7777CA.jpg', 'KA7777CA_2.jpg') - повний конвеєр.
+
+Запуск з кореня репозиторію:
+    python -m DS.funcs_repo.benchmark --images DS/img --workers 4 --output report.json
+    python -m DS.funcs_repo.benchmark --images DS/img --baseline report.json
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+
+import numpy as np
+
+from .camera_profiles import DEFAULT_PROFILE, CameraProfile
+from .configures import INFERENCE_BACKEND, RECOGNITION_MODE, SEGMENTER
+from .datasets import CHARACTER_DATA, iter_character_samples, iter_plate_images, plate_label
+from .parallel import imap_unordered
+from .plate_grammar import edit_distance
+
+STAGES = ('decode', 'detect', 'encode', 'segment', 'classify', 'slow', 'total')
+
+
+def latency_summary(values) -> dict:
+    """
+    Статистика затримок у мілісекундах.
+
+    Параметри:
+    values (list): Тривалості у секундах.
+
+    Повертає:
+    dict: Кількість вимірів, середнє, p50, p95 та p99 у мілісекундах.
+    """
+    if not values:
+        return {'count': 0}
+    ms = np.asarray(values) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        'count': len(values),
+        'mean': round(float(ms.mean()), 3),
+        'p50': round(float(p50), 3),
+        'p95': round(float(p95), 3),
+        'p99': round(float(p99), 3),
+    }
+
+
+def _init_worker(backend: str):
+    from .model_registry import registry
+
+    registry.configure(backend=backend)
+    registry.warm_up()
+
+
+def _run_pipeline(item, mode: str = RECOGNITION_MODE, profile: CameraProfile = DEFAULT_PROFILE) -> dict:
+    """
+    Проганяє одне зображення через усі етапи конвеєра з вимірюванням часу кожного.
+
+    Параметри:
+    item (tuple): Назва файлу та його вміст.
+    mode (str): Режим розпізнавання ('single' або 'tiered').
+    profile (CameraProfile): Параметри виявлення і сегментації.
+
+    Повертає:
+    dict: Назва файлу, правильний і розпізнаний номер, впевненість, тривалість етапів у секундах.
+    """
+    from . import image_process
+
+    name, data = item
+    timings = {}
+    result = {'file': name, 'label': plate_label(name), 'plate': None, 'confidence': None, 'timings': timings}
+    try:
+        _, result['plate'], result['confidence'] = image_process.recognize_plate(data, timings=timings, mode=mode,
+                                                                                    profile=profile)
+    except ValueError as e:
+        result['error'] = str(e)
+    return result
+
+
+def benchmark_images(path: str, workers: int, backend: str, limit: int = None,
+                     mode: str = RECOGNITION_MODE, segmenter: str = SEGMENTER) -> dict:
+    """
+    Бенчмарк повного конвеєра на розмічених фотографіях.
+
+    Параметри:
+    path (str): Каталог або zip-архів фотографій.
+    workers (int): Кількість робочих процесів; 0 - виконання у поточному процесі.
+    backend (str): Середовище виконання класифікатора.
+    limit (int, optional): Максимальна кількість зображень.
+    mode (str): Режим розпізнавання ('single' або 'tiered').
+    segmenter (str): Спосіб пошуку символів ('contours' або 'components').
+
+    Повертає:
+    dict: Статистика етапів, пропускна здатність і точність.
+    """
+    items = iter_plate_images(path)
+    if limit:
+        items = (item for i, item in enumerate(items) if i < limit)
+
+    run = partial(_run_pipeline, mode=mode, profile=CameraProfile(segmenter=segmenter))
+    results = []
+    if workers > 0:
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_init_worker, initargs=(backend,))
+        # Прогрів усіх процесів до початку вимірювань
+        list(pool.map(time.sleep, [0.1] * workers))
+        start = time.perf_counter()
+        results.extend(imap_unordered(pool, run, items, max_pending=workers * 4))
+        elapsed = time.perf_counter() - start
+        pool.shutdown()
+    else:
+        _init_worker(backend)
+        start = time.perf_counter()
+        results.extend(run(item) for item in items)
+        elapsed = time.perf_counter() - start
+
+    processed = [result for result in results if 'error' not in result]
+    plates_total = len(processed)
+    plates_correct = sum(result['plate'] == result['label'] for result in processed)
+    chars_total = sum(len(result['label']) for result in processed)
+    chars_wrong = sum(min(edit_distance(result['plate'] or '', result['label']), len(result['label']))
+                      for result in processed)
+
+    return {
+        'source': path,
+        'count': len(results),
+        'errors': len(results) - plates_total,
+        'mode': mode,
+        'segmenter': segmenter,
+        'detected': sum(result['plate'] is not None for result in processed),
+        'slow_path_ratio': round(sum('slow' in result['timings'] for result in processed) / plates_total, 4)
+        if plates_total else None,
+        'seconds': round(elapsed, 3),
+        'images_per_second': round(len(results) / elapsed, 3) if elapsed else None,
+        'plate_accuracy': round(plates_correct / plates_total, 4) if plates_total else None,
+        'char_accuracy': round(1 - chars_wrong / chars_total, 4) if chars_total else None,
+        'stages': {stage: latency_summary([result['timings'][stage] for result in processed
+                                           if stage in result['timings']])
+                   for stage in STAGES},
+    }
+
+
+def benchmark_characters(path: str, batch_size: int, backend: str) -> dict:
+    """
+    Бенчмарк класифікатора символів на розмічених символах.
+
+    Параметри:
+    path (str): Zip-архів із символами.
+    batch_size (int): Кількість символів в одному проході моделі (типово - довжина номера).
+    backend (str): Середовище виконання класифікатора.
+
+    Повертає:
+    dict: Статистика затримки одного пакету та точність класифікації.
+    """
+    from .configures import CHARACTERS
+    from .model_registry import registry
+
+    registry.configure(backend=backend)
+    registry.warm_up()
+
+    timings, correct, total = [], 0, 0
+    images, labels = [], []
+    samples = iter_character_samples(path)
+    while True:
+        sample = next(samples, None)
+        if sample is not None:
+            images.append(sample[0])
+            labels.append(sample[1])
+            if len(images) < batch_size:
+                continue
+        if images:
+            start = time.perf_counter()
+            y_proba = registry.classifier.predict_on_batch(np.stack(images).astype(np.float32))
+            timings.append(time.perf_counter() - start)
+            correct += sum(CHARACTERS[i] == label for i, label in zip(np.argmax(y_proba, axis=1), labels))
+            total += len(labels)
+            images, labels = [], []
+        if sample is None:
+            break
+
+    return {
+        'source': path,
+        'count': total,
+        'batch_size': batch_size,
+        'accuracy': round(correct / total, 4) if total else None,
+        'stages': {'classify': latency_summary(timings)},
+    }
+
+
+def peak_rss_mb() -> dict:
+    """
+    Пікове використання пам'яті поточним процесом і найбільшим із завершених дочірніх процесів.
+    """
+    return {
+        'self': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'children': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float, accuracy_tolerance: float) -> bool:
+    """
+    Порівнює звіт з базовим і друкує зміни.
+
+    Параметри:
+    report (dict): Поточний звіт.
+    baseline (dict): Базовий звіт.
+    tolerance (float): Допустиме погіршення затримки та пропускної здатності, у відсотках.
+    accuracy_tolerance (float): Допустиме зниження точності (частка від 1).
+
+    Повертає:
+    bool: True, якщо погіршень понад допустимі немає.
+    """
+    passed = True
+
+    def check(label, current, previous, higher_is_better, limit, relative=True):
+        nonlocal passed
+        if current is None or previous is None:
+            return
+        change = (current - previous) / previous * 100 if relative and previous else current - previous
+        worse = -change if higher_is_better else change
+        failed = worse > limit
+        passed = passed and not failed
+        unit = '%' if relative else ''
+        print(f"{label:<32} {previous:>10} -> {current:>10} ({change:+.2f}{unit}){' REGRESSION' if failed else ''}")
+
+    for section in ('images', 'characters'):
+        current, previous = report.get(section), baseline.get(section)
+        if not current or not previous:
+            continue
+        for stage, stats in current['stages'].items():
+            for key in ('p50', 'p95'):
+                check(f'{section}.{stage}.{key}', stats.get(key),
+                      previous['stages'].get(stage, {}).get(key), False, tolerance)
+        if section == 'images':
+            check('images.images_per_second', current['images_per_second'],
+                  previous['images_per_second'], True, tolerance)
+            for key in ('plate_accuracy', 'char_accuracy'):
+                check(f'images.{key}', current[key], previous[key], True, accuracy_tolerance, relative=False)
+        else:
+            check('characters.accuracy', current['accuracy'], previous['accuracy'],
+                  True, accuracy_tolerance, relative=False)
+    return passed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Бенчмарк розпізнавання номерних знаків')
+    parser.add_argument('--images', help='каталог або zip-архів фотографій, назва файлу - правильний номер')
+    parser.add_argument('--characters', default=CHARACTER_DATA, help='архів з розміченими символами')
+    parser.add_argument('--no-characters', action='store_true', help='не запускати бенчмарк класифікатора')
+    parser.add_argument('--workers', type=int, default=1, help='кількість процесів; 0 - у поточному процесі')
+    parser.add_argument('--backend', default=INFERENCE_BACKEND, help="'keras', 'tflite' або 'onnx'")
+    parser.add_argument('--mode', default=RECOGNITION_MODE, help="режим розпізнавання: 'single' або 'tiered'")
+    parser.add_argument('--segmenter', default=SEGMENTER,
+                        help="пошук символів: 'contours' або 'components'")
+    parser.add_argument('--batch-size', type=int, default=8, help='розмір пакету символів')
+    parser.add_argument('--limit', type=int, help='максимальна кількість фотографій')
+    parser.add_argument('--output', help='шлях для збереження JSON-звіту')
+    parser.add_argument('--baseline', help='JSON-звіт для порівняння')
+    parser.add_argument('--tolerance', type=float, default=10.0, help='допустиме погіршення швидкості, %%')
+    parser.add_argument('--accuracy-tolerance', type=float, default=0.005, help='допустиме зниження точності')
+    args = parser.parse_args(argv)
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'backend': args.backend,
+        'workers': args.workers,
+    }
+    if not args.no_characters:
+        report['characters'] = benchmark_characters(args.characters, args.batch_size, args.backend)
+    if args.images:
+        report['images'] = benchmark_images(args.images, args.workers, args.backend, args.limit, args.mode,
+                                            args.segmenter)
+    report['peak_rss_mb'] = peak_rss_mb()
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        return 0 if compare(report, baseline, args.tolerance, args.accuracy_tolerance) else 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
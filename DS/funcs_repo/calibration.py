@@ -0,0 +1,134 @@
+"""
+Калібрування впевненості класифікатора символів температурним масштабуванням.
+
+Класифікатор видає майже завжди ймовірність 1.0 для вибраного символу, навіть коли
+помиляється, тож добуток таких ймовірностей не відрізняє надійні номери від сумнівних.
+Логарифми ймовірностей діляться на температуру T > 1, підібрану за мінімумом
+від'ємної логарифмічної правдоподібності на розмічених даних; вибраний символ не змінюється.
+
+Підбір температури з кореня репозиторію (результат - значення CONFIDENCE_TEMPERATURE у configures.py):
+    python -m DS.funcs_repo.calibration
+    python -m DS.funcs_repo.calibration --images DS/img
+"""
+import argparse
+import json
+
+import numpy as np
+
+from .configures import CHARACTERS, INFERENCE_BACKEND
+
+# Мінімальна ймовірність: softmax у float32 повертає 0 для більшості класів
+PROBABILITY_FLOOR = 1e-7
+
+
+def temperature_scale(y_proba, temperature: float):
+    """
+    Перераховує ймовірності класів з температурою.
+
+    Параметри:
+    y_proba (numpy.ndarray): Ймовірності класів з розмірами (N, len(CHARACTERS)).
+    temperature (float): Температура; 1 - без змін, більше 1 - менш впевнені ймовірності.
+
+    Повертає:
+    numpy.ndarray: Відкалібровані ймовірності з тими самими розмірами.
+    """
+    if temperature == 1 or len(y_proba) == 0:
+        return y_proba
+    logits = np.log(np.clip(y_proba, PROBABILITY_FLOOR, 1)) / temperature
+    logits -= logits.max(axis=1, keepdims=True)
+    scaled = np.exp(logits)
+    return scaled / scaled.sum(axis=1, keepdims=True)
+
+
+def negative_log_likelihood(y_proba, labels) -> float:
+    """
+    Середня від'ємна логарифмічна правдоподібність правильних класів.
+    """
+    return float(-np.log(np.clip(y_proba[np.arange(len(labels)), labels], PROBABILITY_FLOOR, 1)).mean())
+
+
+def fit_temperature(y_proba, labels, candidates=None) -> float:
+    """
+    Підбирає температуру з мінімальною від'ємною логарифмічною правдоподібністю.
+
+    Параметри:
+    y_proba (numpy.ndarray): Ймовірності класів з розмірами (N, len(CHARACTERS)).
+    labels (numpy.ndarray): Індекси правильних класів.
+    candidates (iterable, optional): Температури для перебору (за замовчуванням 0.5-20 у логарифмічній шкалі).
+
+    Повертає:
+    float: Найкраща температура.
+    """
+    candidates = np.geomspace(0.5, 20, 60) if candidates is None else candidates
+    losses = [negative_log_likelihood(temperature_scale(y_proba, t), labels) for t in candidates]
+    return round(float(candidates[int(np.argmin(losses))]), 3)
+
+
+def plate_character_labels(path: str):
+    """
+    Ймовірності та правильні класи символів з розмічених фотографій номерних знаків.
+
+    Використовуються лише номери, для яких кількість знайдених символів збігається з
+    довжиною правильного номера, інакше символи неможливо зіставити за позиціями.
+
+    Параметри:
+    path (str): Каталог або zip-архів фотографій, назва файлу - правильний номер.
+
+    Повертає:
+    numpy.ndarray: Ймовірності класів.
+    numpy.ndarray: Індекси правильних класів.
+    """
+    from . import image_process
+    from .datasets import iter_plate_images, plate_label
+
+    probabilities, labels = [], []
+    for name, data in iter_plate_images(path):
+        label = plate_label(name)
+        _, plate = image_process.detect_plate(image_process.load_image(data))
+        if plate is None:
+            continue
+        y_proba = image_process.character_probabilities(image_process.segment_characters(plate),
+                                                        temperature=1)
+        if len(y_proba) == len(label) and all(char in CHARACTERS for char in label):
+            probabilities.append(y_proba)
+            labels.extend(CHARACTERS.index(char) for char in label)
+    if not probabilities:
+        return np.zeros((0, len(CHARACTERS)), dtype=np.float32), np.zeros(0, dtype=int)
+    return np.concatenate(probabilities), np.array(labels)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Підбір температури калібрування впевненості.')
+    parser.add_argument('--data', default=None, help='Zip-архів із символами (за замовчуванням DS/data.zip)')
+    parser.add_argument('--split', default='val', help='Частина набору символів: train або val')
+    parser.add_argument('--images', help='Каталог або zip-архів розмічених фотографій номерних знаків')
+    parser.add_argument('--backend', default=INFERENCE_BACKEND, help='keras, tflite або onnx')
+    args = parser.parse_args(argv)
+
+    from .datasets import CHARACTER_DATA, load_character_batch
+    from .model_registry import registry
+
+    registry.configure(backend=args.backend)
+    if args.images:
+        y_proba, labels = plate_character_labels(args.images)
+    else:
+        images, labels = load_character_batch(args.data or CHARACTER_DATA, args.split)
+        y_proba = np.asarray(registry.classifier.predict_on_batch(images))
+    if not len(labels):
+        raise SystemExit('Немає розмічених символів для калібрування')
+
+    temperature = fit_temperature(y_proba, labels)
+    calibrated = temperature_scale(y_proba, temperature)
+    print(json.dumps({
+        'count': int(len(labels)),
+        'accuracy': round(float((y_proba.argmax(axis=1) == labels).mean()), 4),
+        'temperature': temperature,
+        'nll_before': round(negative_log_likelihood(y_proba, labels), 4),
+        'nll_after': round(negative_log_likelihood(calibrated, labels), 4),
+        'mean_confidence_before': round(float(y_proba.max(axis=1).mean()), 4),
+        'mean_confidence_after': round(float(calibrated.max(axis=1).mean()), 4),
+    }))
+
+
+if __name__ == '__main__':
+    main()
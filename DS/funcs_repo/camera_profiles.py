@@ -0,0 +1,151 @@
+"""
+Налаштування розпізнавання для окремих камер.
+
+Файл профілів - JSON-об'єкт {ідентифікатор камери: профіль}. Профіль 'default'
+(необов'язковий) змінює глобальні значення з configures.py для всіх камер, а
+профілі камер успадковують його і перевизначають лише вказані поля:
+
+    {
+        "default": {"fast_min_confidence": 0.85},
+        "gate-1": {"roi": [400, 600, 1200, 500], "min_plate_size": [120, 30], "max_plate_size": [500, 130]},
+        "gate-2": {"roi": [0, 300, 900, 400], "scale_factor": 1.2, "min_neighbors": 6}
+    }
+
+Усі розміри задаються у пікселях повного кадру: roi - [x, y, w, h],
+min_plate_size / max_plate_size - [w, h] для minSize / maxSize каскаду.
+"""
+import json
+import os
+from dataclasses import dataclass, fields, replace
+
+from .configures import *
+
+
+@dataclass(frozen=True)
+class CameraProfile:
+    """
+    Профіль однієї камери: область кадру зі смугою руху, очікуваний розмір
+    номерного знаку та параметри виявлення і сегментації.
+    """
+    camera_id: str = 'default'
+    roi: tuple = None
+    min_plate_size: tuple = None
+    max_plate_size: tuple = None
+    scale_factor: float = SCALE_FACTOR
+    min_neighbors: int = MIN_NEIGHBORS
+    max_width: int = DETECTION_MAX_WIDTH
+    fast_max_width: int = FAST_MAX_WIDTH
+    fast_min_confidence: float = FAST_MIN_CONFIDENCE
+    threshold: int = None
+    width_lower: float = WIDTH_LOWER
+    width_upper: float = WIDTH_UPPER
+    heigh_lower: float = HEIGH_LOWER
+    heigh_upper: float = HEIGH_UPPER
+    segmenter: str = SEGMENTER
+
+    @property
+    def char_bounds(self) -> tuple:
+        """
+        Коефіцієнти розмірів контурів символів для segment_characters.
+        """
+        return self.width_lower, self.width_upper, self.heigh_lower, self.heigh_upper
+
+    def segmentation_args(self) -> dict:
+        """
+        Аргументи segment_characters для цього профілю.
+        """
+        return {'threshold': self.threshold, 'bounds': self.char_bounds, 'segmenter': self.segmenter}
+
+    def detection_args(self, max_width: int = None) -> dict:
+        """
+        Аргументи find_plates для цього профілю.
+
+        Параметри:
+        max_width (int, optional): Ширина зображення для пошуку замість max_width профілю.
+        """
+        return {
+            'max_width': max_width or self.max_width,
+            'scale_factor': self.scale_factor,
+            'min_neighbors': self.min_neighbors,
+            'roi': self.roi,
+            'min_size': self.min_plate_size,
+            'max_size': self.max_plate_size,
+        }
+
+    @classmethod
+    def from_dict(cls, camera_id: str, data: dict, base: 'CameraProfile' = None) -> 'CameraProfile':
+        """
+        Створює профіль зі словника, успадковуючи значення, яких у ньому немає, з base.
+
+        Raises:
+        ValueError: Якщо словник містить невідомі поля або розміри неправильної довжини.
+        """
+        names = {field.name for field in fields(cls)} - {'camera_id'}
+        unknown = set(data) - names
+        if unknown:
+            raise ValueError(f"Невідомі поля у профілі камери '{camera_id}': {', '.join(sorted(unknown))}")
+        values = dict(data)
+        for name, length in (('roi', 4), ('min_plate_size', 2), ('max_plate_size', 2)):
+            if values.get(name) is not None:
+                if len(values[name]) != length:
+                    raise ValueError(f"Поле {name} профілю камери '{camera_id}' має містити {length} числа")
+                values[name] = tuple(int(v) for v in values[name])
+        return replace(base or cls(), camera_id=camera_id, **values)
+
+
+DEFAULT_PROFILE = CameraProfile()
+
+
+def load_profiles(path: str = CAMERA_PROFILES) -> dict:
+    """
+    Завантажує профілі камер з JSON-файлу.
+
+    Параметри:
+    path (str): Шлях до файлу профілів. Якщо файлу немає, повертається лише профіль за замовчуванням.
+
+    Повертає:
+    dict: {ідентифікатор камери: CameraProfile}, завжди з ключем 'default'.
+
+    Raises:
+    ValueError: Якщо файл містить невідомі поля.
+    """
+    if not path or not os.path.exists(path):
+        return {'default': DEFAULT_PROFILE}
+    with open(path, encoding='utf-8') as file:
+        data = json.load(file)
+    default = CameraProfile.from_dict('default', data.get('default', {}))
+    profiles = {'default': default}
+    for camera_id, values in data.items():
+        if camera_id != 'default':
+            profiles[camera_id] = CameraProfile.from_dict(camera_id, values, base=default)
+    return profiles
+
+
+
+def save_profile(camera_id: str, values: dict, path: str = CAMERA_PROFILES):
+    """
+    Записує поля профілю камери у JSON-файл, зберігаючи інші камери та поля.
+
+    Файл замінюється атомарно, тож процес, що саме читає профілі, не побачить
+    частково записаний файл.
+
+    Параметри:
+    camera_id (str): Ідентифікатор камери ('default' - для всіх камер).
+    values (dict): Поля профілю, які потрібно змінити.
+    path (str): Шлях до файлу профілів.
+
+    Raises:
+    ValueError: Якщо values містить невідомі поля.
+    """
+    CameraProfile.from_dict(camera_id, values)
+    data = {}
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+    data.setdefault(camera_id, {}).update(values)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path + '.tmp', 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=4, ensure_ascii=False)
+    os.replace(path + '.tmp', path)
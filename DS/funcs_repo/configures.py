@@ -1,15 +1,115 @@
 CASCADE_ClASIFIER = 'DS/models/haarcascade_ua_license_plate.xml'
 MODEL = 'DS/models/model.keras'
+MODEL_TFLITE = 'DS/models/model.tflite'
+MODEL_ONNX = 'DS/models/model.onnx'
 
-# Формат збереження зображення після обробки
+# середовище виконання класифікатора символів: 'keras', 'tflite' або 'onnx'
+INFERENCE_BACKEND = 'keras'
+
+# Класи символів, які розпізнає модель, у порядку її виходів
+CHARACTERS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+# температура калібрування ймовірностей символів (1 - ймовірності моделі без змін);
+# підбирається на розмічених фотографіях з камер в'їзду: python -m DS.funcs_repo.calibration --images <каталог>
+# (на чистих символах DS/data.zip виходить 1.86, на фотографіях DS/img - 3.7, тож значення залежить від камер)
+CONFIDENCE_TEMPERATURE = 1.0
+
+# допустима кількість символів номерного знаку (AA1234BB)
+PLATE_LENGTHS = (8,)
+# формати номерних знаків: L - літера з PLATE_LETTERS, D - цифра
+PLATE_FORMATS = ('LLDDDDLL',)
+# латинські літери, що збігаються з кириличними літерами українських номерних знаків
+PLATE_LETTERS = 'ABCEHIKMOPTX'
+
+# файл профілів камер: область кадру, розміри номерного знаку та параметри для кожної камери
+CAMERA_PROFILES = 'DS/camera_profiles.json'
+
+# режим розпізнавання: 'single' - один прохід, 'tiered' - швидкий прохід і повільний за низької впевненості;
+# поріг FAST_MIN_CONFIDENCE порівнюється з відкаліброваною впевненістю, тож перед увімкненням 'tiered'
+# потрібно підібрати CONFIDENCE_TEMPERATURE і перевірити точність на власних фотографіях (python -m DS.funcs_repo.benchmark)
+RECOGNITION_MODE = 'single'
+# швидкий прохід: максимальна ширина зображення для пошуку номерного знаку та мінімальна впевненість
+FAST_MAX_WIDTH = 800
+FAST_MIN_CONFIDENCE = 0.9
+# повільний прохід: пари (scaleFactor, minNeighbors) каскаду, кількість кандидатів і пороги бінаризації (None - Оцу)
+SLOW_DETECTION_PARAMS = [(1.1, 3), (1.3, 8)]
+SLOW_MAX_CANDIDATES = 4
+SLOW_THRESHOLDS = [None, 100, 150]
+
+# Формат збереження зображення після обробки: 'jpg', 'webp' або 'png'
+# (рекомендовано 'jpg' з OUTPUT_MAX_SIZE = 1280: кодування - мілісекунди замість сотень мілісекунд,
+# файл - десятки кілобайт замість мегабайтів)
 OUTPUT_FORMAT = 'png'
+# якість JPEG / WebP (1-100)
+OUTPUT_QUALITY = 85
+# найбільша сторона зображення після обробки у пікселях (None - повна роздільність)
+OUTPUT_MAX_SIZE = None
+# зберігати лише область номерного знаку замість усього кадру з рамкою
+OUTPUT_CROP = False
 
-# коефіцієнти розпізнавання контурів номерного знака
-SCALE_FACTOR = 1.15
-MIN_NEIGHBORS = 7
+# коефіцієнти розпізнавання контурів номерного знака (scaleFactor і minNeighbors каскаду)
+SCALE_FACTOR = 1.3
+MIN_NEIGHBORS = 8
+# максимальна ширина зображення для пошуку номерного знаку (None - повна роздільність);
+# ширші кадри зменшуються, а знайдені області переводяться у координати повного кадру
+DETECTION_MAX_WIDTH = None
 
 # коефіцієнти розмірів контурів символів обрізаного номерного знака у функції detect_plate
 WIDTH_LOWER = 1/10
 WIDTH_UPPER = 2/3
 HEIGH_LOWER = 1/10
-HEIGH_UPPER = 3/5
\ No newline at end of file
+HEIGH_UPPER = 3/5
+
+# спосіб пошуку символів на номерному знаку: 'contours' - контури (findContours),
+# 'components' - зв'язні компоненти (connectedComponentsWithStats) з векторною фільтрацією
+SEGMENTER = 'contours'
+
+# сітка значень для підбору параметрів виявлення і сегментації (python -m DS.funcs_repo.tuning)
+TUNING_GRID = {
+    'scale_factor': [1.1, 1.2, 1.3, 1.4],
+    'min_neighbors': [3, 5, 8],
+    'width_lower': [1/12, 1/10, 1/8],
+    'width_upper': [1/2, 2/3],
+    'heigh_lower': [1/10],
+    'heigh_upper': [1/2, 3/5, 2/3],
+}
+
+# кількість робочих процесів для розпізнавання номерних знаків
+INFERENCE_WORKERS = 2
+
+# пакетна класифікація символів з усіх одночасних запитів:
+# максимальна кількість символів у пакеті та максимальне очікування на його наповнення (мс)
+BATCH_MAX_SIZE = 64
+BATCH_MAX_WAIT_MS = 5
+# найдовше очікування (секунд) робочим процесом на відповідь сервера класифікації; має покривати
+# завантаження моделі сервером, на яке чекає перший запит
+BATCH_RESPONSE_TIMEOUT = 60
+
+# кількість пробних проходів моделей під час запуску робочого процесу (0 - лише завантаження)
+WARMUP_RUNS = 1
+
+# найдовше очікування (секунд), доки всі робочі процеси завантажать моделі під час запуску пулу
+WORKER_START_TIMEOUT = 600
+
+# кеш результатів розпізнавання повторних кадрів:
+# кількість записів (0 - вимкнено), час життя запису (с) та допустима відстань Геммінга між хешами
+# (0 - лише байт-у-байт однакові кадри; більше 0 - перцептивний хеш усього кадру, який не розрізняє
+# номерні знаки, тож наступний автомобіль біля нерухомої камери може отримати номер попереднього)
+CACHE_SIZE = 0
+CACHE_TTL_SECONDS = 10
+CACHE_MAX_DISTANCE = 0
+
+# потоковий режим: частота кадрів для каталогу кадрів без метаданих
+STREAM_FPS = 25
+# фільтр руху: мінімальна зміна яскравості пікселя та частка змінених пікселів кадру
+MOTION_THRESHOLD = 25
+MOTION_MIN_AREA = 0.002
+# супроводження номерних знаків: мінімальний IoU зіставлення та кількість кадрів з рухом без
+# зіставлення, після яких трек завершується
+TRACK_IOU = 0.3
+TRACK_MAX_MISSED = 10
+# розпізнавання символів треку повторюється, поки впевненість консенсусу нижча за поріг або
+# прочитань менше STREAM_MIN_READS, але не більше STREAM_MAX_READS разів
+STREAM_MIN_CONFIDENCE = 0.9
+STREAM_MIN_READS = 3
+STREAM_MAX_READS = 5
@@ -0,0 +1,107 @@
+"""
+Експорт моделі розпізнавання символів у TFLite та ONNX з перевіркою відповідності.
+
+Кожен експортований бекенд порівнюється з моделлю Keras на розмічених символах
+з DS/data.zip: класи мають збігатися повністю, а ймовірності - з точністю atol.
+
+Запуск з кореня репозиторію:
+    python -m DS.funcs_repo.convert_model --format tflite onnx
+    python -m DS.funcs_repo.convert_model --check-only
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from .configures import MODEL_TFLITE, MODEL_ONNX
+from .datasets import CHARACTER_DATA, load_character_batch
+from .inference_backend import KerasBackend, load_backend
+
+EXPORT_PATHS = {
+    'tflite': MODEL_TFLITE,
+    'onnx': MODEL_ONNX,
+}
+
+
+def export_tflite(model, path: str = MODEL_TFLITE):
+    """
+    Конвертує модель Keras у TFLite.
+
+    Параметри:
+    model (keras.Model): Модель Keras.
+    path (str): Шлях до вихідного файлу .tflite.
+    """
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    with open(path, 'wb') as file:
+        file.write(converter.convert())
+
+
+def export_onnx(model, path: str = MODEL_ONNX):
+    """
+    Конвертує модель Keras у ONNX з довільним розміром пакету.
+
+    Параметри:
+    model (keras.Model): Модель Keras.
+    path (str): Шлях до вихідного файлу .onnx.
+    """
+    import tensorflow as tf
+    import tf2onnx
+
+    input_signature = (tf.TensorSpec((None, 28, 28, 3), tf.float32, name='input'),)
+    tf2onnx.convert.from_keras(model, input_signature=input_signature, output_path=path)
+
+
+EXPORTERS = {
+    'tflite': export_tflite,
+    'onnx': export_onnx,
+}
+
+
+def check_parity(name: str, batch, labels, reference, atol: float) -> bool:
+    """
+    Порівнює відповіді бекенду з еталонними ймовірностями моделі Keras.
+
+    Параметри:
+    name (str): Назва бекенду.
+    batch (numpy.ndarray): Пакет зображень символів.
+    labels (numpy.ndarray): Індекси правильних класів.
+    reference (numpy.ndarray): Ймовірності, отримані від моделі Keras.
+    atol (float): Допустима абсолютна різниця ймовірностей.
+
+    Повертає:
+    bool: True, якщо бекенд відповідає еталону.
+    """
+    y_proba = load_backend(name, EXPORT_PATHS.get(name)).predict_on_batch(batch)
+    max_diff = float(np.abs(y_proba - reference).max())
+    agreement = float((y_proba.argmax(axis=1) == reference.argmax(axis=1)).mean())
+    accuracy = float((y_proba.argmax(axis=1) == labels).mean())
+    passed = agreement == 1.0 and max_diff <= atol
+    print(f"{name:>6}: {'OK' if passed else 'FAIL'} max_diff={max_diff:.2e} "
+          f"agreement={agreement:.4f} accuracy={accuracy:.4f}")
+    return passed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Експорт моделі символів у TFLite/ONNX')
+    parser.add_argument('--format', nargs='+', choices=list(EXPORTERS), default=list(EXPORTERS))
+    parser.add_argument('--check-only', action='store_true', help='лише перевірити вже експортовані моделі')
+    parser.add_argument('--data', default=CHARACTER_DATA, help='архів з розміченими символами')
+    parser.add_argument('--atol', type=float, default=1e-4, help='допустима різниця ймовірностей')
+    args = parser.parse_args(argv)
+
+    keras_backend = KerasBackend()
+    if not args.check_only:
+        for name in args.format:
+            EXPORTERS[name](keras_backend.model, EXPORT_PATHS[name])
+            print(f'{name:>6}: збережено {EXPORT_PATHS[name]}')
+
+    batch, labels = load_character_batch(args.data)
+    reference = keras_backend.predict_on_batch(batch)
+    results = [check_parity(name, batch, labels, reference, args.atol) for name in args.format]
+    return 0 if all(results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import os
+import zipfile
+
+import cv2
+import numpy as np
+
+from .configures import CHARACTERS
+
+# Архів з розміченими зображеннями символів: data/<split>/class_<символ>/<файл>.jpg
+CHARACTER_DATA = 'DS/data.zip'
+
+
+def iter_character_samples(path: str = CHARACTER_DATA, split: str = 'val'):
+    """
+    Потоково читає розмічені зображення символів з архіву без розпакування на диск.
+
+    Параметри:
+    path (str): Шлях до zip-архіву з даними.
+    split (str): Частина набору даних: 'train' або 'val'.
+
+    Повертає:
+    generator: Пари (зображення BGR розміром 28x28, символ).
+    """
+    with zipfile.ZipFile(path) as archive:
+        for name in sorted(archive.namelist()):
+            parts = name.split('/')
+            if len(parts) != 4 or parts[1] != split or not name.endswith('.jpg'):
+                continue
+            img = cv2.imdecode(np.frombuffer(archive.read(name), dtype=np.uint8), cv2.IMREAD_COLOR)
+            if img is None:
+                continue
+            yield cv2.resize(img, (28, 28)), parts[2].removeprefix('class_')
+
+
+def load_character_batch(path: str = CHARACTER_DATA, split: str = 'val'):
+    """
+    Завантажує розмічені символи одним пакетом для класифікатора.
+
+    Параметри:
+    path (str): Шлях до zip-архіву з даними.
+    split (str): Частина набору даних: 'train' або 'val'.
+
+    Повертає:
+    numpy.ndarray: Пакет зображень з розмірами (N, 28, 28, 3).
+    numpy.ndarray: Індекси правильних класів у CHARACTERS.
+    """
+    images, labels = [], []
+    for img, label in iter_character_samples(path, split):
+        images.append(img)
+        labels.append(CHARACTERS.index(label))
+    return np.stack(images).astype(np.float32), np.array(labels)
+
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+
+
+def plate_label(file_name: str) -> str:
+    """
+    Повертає номерний знак, закодований у назві файлу: 'KA7777CA.jpg' або 'KA7777CA_2.jpg'.
+
+    Параметри:
+    file_name (str): Назва або шлях до файлу.
+
+    Повертає:
+    str: Номерний знак у верхньому регістрі.
+    """
+    stem = os.path.splitext(os.path.basename(file_name))[0]
+    return stem.split('_')[0].replace(' ', '').replace('-', '').upper()
+
+
+def iter_plate_images(path: str, exclude=()):
+    """
+    Потоково читає фотографії автомобілів з каталогу або zip-архіву.
+
+    Параметри:
+    path (str): Каталог або zip-архів із зображеннями.
+    exclude (set, optional): Назви файлів, які потрібно пропустити без читання.
+
+    Повертає:
+    generator: Пари (назва файлу, вміст файлу у bytes), відсортовані за назвою.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for name in sorted(archive.namelist()):
+                if name.lower().endswith(IMAGE_EXTENSIONS) and name not in exclude:
+                    yield name, archive.read(name)
+        return
+    for root, _, files in sorted(os.walk(path)):
+        for file_name in sorted(files):
+            if not file_name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            file_path = os.path.join(root, file_name)
+            name = os.path.relpath(file_path, path)
+            if name not in exclude:
+                with open(file_path, 'rb') as file:
+                    yield name, file.read()
@@ -0,0 +1,106 @@
+"""
+Кодування зображення-результату розпізнавання.
+
+Зображення з рамкою навколо номерного знаку зберігається у хмарному сховищі,
+тож його формат, якість і розмір визначають і затримку запиту, і обсяг передачі.
+PNG повної роздільності кодується сотні мілісекунд і займає мегабайти; JPEG або WebP,
+зменшений до OUTPUT_MAX_SIZE, - кілька мілісекунд і десятки кілобайт.
+
+Кодування виконується у фоновому потоці (cv2.imencode звільняє GIL), тож
+поєднується у часі з сегментацією і класифікацією символів.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+from .configures import OUTPUT_FORMAT, OUTPUT_QUALITY, OUTPUT_MAX_SIZE, OUTPUT_CROP
+
+# Параметр якості cv2.imwrite для кожного формату; PNG кодується без втрат з найшвидшим стисненням
+QUALITY_PARAMS = {
+    'jpg': cv2.IMWRITE_JPEG_QUALITY,
+    'webp': cv2.IMWRITE_WEBP_QUALITY,
+    'png': None,
+}
+
+
+@dataclass(frozen=True)
+class OutputOptions:
+    """
+    Параметри зображення-результату.
+
+    format - 'jpg', 'webp' або 'png'; quality - якість 1-100 для JPEG і WebP;
+    max_size - найбільша сторона у пікселях (None - без зменшення);
+    crop - повертати лише область номерного знаку замість кадру з рамкою.
+    """
+    format: str = OUTPUT_FORMAT
+    quality: int = OUTPUT_QUALITY
+    max_size: int = OUTPUT_MAX_SIZE
+    crop: bool = OUTPUT_CROP
+
+    def __post_init__(self):
+        if self.format not in QUALITY_PARAMS:
+            raise ValueError(f'Невідомий формат зображення: {self.format}')
+        if not 1 <= self.quality <= 100:
+            raise ValueError(f'Якість зображення має бути від 1 до 100: {self.quality}')
+
+    @property
+    def encode_params(self) -> list:
+        flag = QUALITY_PARAMS[self.format]
+        return [flag, int(self.quality)] if flag is not None else []
+
+
+DEFAULT_OUTPUT = OutputOptions()
+
+
+def fit_size(img, max_size: int = None):
+    """
+    Зменшує зображення так, щоб більша сторона не перевищувала max_size.
+
+    Повертає:
+    numpy.array: Зменшена копія або вихідне зображення, якщо воно не більше за max_size.
+    float: Коефіцієнт зменшення (1.0, якщо зображення не змінювалось).
+    """
+    if not max_size or max(img.shape[:2]) <= max_size:
+        return img, 1.0
+    ratio = max_size / max(img.shape[:2])
+    return cv2.resize(img, None, fx=ratio, fy=ratio, interpolation=cv2.INTER_AREA), ratio
+
+
+def encode_image(img, options: OutputOptions = DEFAULT_OUTPUT) -> bytes:
+    """
+    Кодує зображення у вибраний формат.
+
+    Параметри:
+    img (numpy.array): Зображення BGR.
+    options (OutputOptions): Формат і якість.
+
+    Повертає:
+    bytes: Закодоване зображення.
+
+    Raises:
+    ValueError: Якщо зображення не вдалося закодувати.
+    """
+    ok, img_buffer = cv2.imencode(f'.{options.format}', np.ascontiguousarray(img), options.encode_params)
+    if not ok:
+        raise ValueError('Не вдалося закодувати зображення')
+    return img_buffer.tobytes()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def submit(fn, *args, **kwargs) -> Future:
+    """
+    Виконує fn у фоновому потоці кодування поточного процесу.
+
+    Потік один: у робочому процесі розпізнавання одночасно кодується не більше одного зображення.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='encode')
+    return _executor.submit(fn, *args, **kwargs)
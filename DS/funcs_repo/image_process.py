@@ -1,9 +1,16 @@
+import os
+
 import cv2
 from datetime import datetime
 import numpy as np
-from keras.models import load_model
 
+from .calibration import temperature_scale
+from .camera_profiles import DEFAULT_PROFILE, CameraProfile
 from .configures import *
+from .image_output import DEFAULT_OUTPUT, OutputOptions, encode_image, fit_size, submit
+from .metrics import StageTimer
+from .model_registry import registry
+from .plate_grammar import grammar_score, plate_rank
 
 # CASCADE_ClASIFIER = 'DS/models/haarcascade_ua_license_plate.xml'
 # MODEL = 'DS/models/model.keras'
@@ -25,45 +32,249 @@ from .configures import *
 
 
 
-model = load_model(MODEL, compile=False)
-plate_cascade = cv2.CascadeClassifier(CASCADE_ClASIFIER)
+def __getattr__(name):
+    """
+    Зворотна сумісність: model та plate_cascade завантажуються реєстром під час першого звернення.
+    """
+    if name == 'model':
+        return registry.classifier
+    if name == 'plate_cascade':
+        return registry.cascade
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def to_gray(img):
+    """
+    Переводить зображення BGR у відтінки сірого; зображення у відтінках сірого повертається без змін.
+    """
+    return img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+
+def _downscale(img, max_width: int = None):
+    """
+    Зменшує зображення до ширини max_width.
+
+    Повертає:
+    numpy.array: Зменшене (або вихідне) зображення.
+    float: Коефіцієнт зменшення (1.0, якщо зображення не змінювалось).
+    """
+    if not max_width or img.shape[1] <= max_width:
+        return img, 1.0
+    ratio = max_width / img.shape[1]
+    return cv2.resize(img, None, fx=ratio, fy=ratio, interpolation=cv2.INTER_AREA), ratio
+
+
+def _region(img, roi=None):
+    """
+    Повертає область кадру без копіювання та її зміщення відносно кадру.
+    """
+    if roi is None:
+        return img, (0, 0)
+    x, y, w, h = roi
+    x, y = max(0, x), max(0, y)
+    return img[y:y+h, x:x+w], (x, y)
+
+
+def _size_limits(ratio: float, min_size=None, max_size=None) -> dict:
+    """
+    Аргументи minSize / maxSize каскаду для зменшеного у ratio разів зображення.
+    """
+    limits = {}
+    if min_size:
+        limits['minSize'] = tuple(max(1, int(v * ratio)) for v in min_size)
+    if max_size:
+        limits['maxSize'] = tuple(max(1, int(v * ratio)) for v in max_size)
+    return limits
+
+
+def find_plates(img, max_width: int = DETECTION_MAX_WIDTH, scale_factor: float = SCALE_FACTOR,
+                min_neighbors: int = MIN_NEIGHBORS, roi=None, min_size=None, max_size=None):
+    """
+    Знаходить області номерних знаків на зображенні без його зміни.
+
+    Зображення обрізається до області roi і, якщо воно ширше за max_width, зменшується;
+    у відтінки сірого переводиться вже зменшена копія. Прямокутники переводяться назад
+    у координати вихідного зображення.
+
+    Параметри:
+    img (numpy.array): Зображення BGR або у відтінках сірого.
+    max_width (int, optional): Максимальна ширина зображення для пошуку (None - повна роздільність).
+    scale_factor (float): Параметр scaleFactor каскаду.
+    min_neighbors (int): Параметр minNeighbors каскаду.
+    roi (tuple, optional): Область пошуку (x, y, w, h) у пікселях кадру.
+    min_size (tuple, optional): Мінімальний розмір номерного знаку (w, h) у пікселях кадру.
+    max_size (tuple, optional): Максимальний розмір номерного знаку (w, h) у пікселях кадру.
+
+    Повертає:
+    list: Прямокутники (x, y, w, h) виявлених номерних знаків.
+    """
+    region, (offset_x, offset_y) = _region(img, roi)
+    small, ratio = _downscale(region, max_width)
+    plate_rect = registry.cascade.detectMultiScale(to_gray(small), scaleFactor=scale_factor, minNeighbors=min_neighbors,
+                                                   **_size_limits(ratio, min_size, max_size))
+    return [(int(round(x / ratio)) + offset_x, int(round(y / ratio)) + offset_y,
+             int(round(w / ratio)), int(round(h / ratio))) for (x, y, w, h) in plate_rect]
+
+
+def find_plate_candidates(img, params=SLOW_DETECTION_PARAMS, max_candidates: int = SLOW_MAX_CANDIDATES,
+                          roi=None, min_size=None, max_size=None):
+    """
+    Шукає номерні знаки з кількома наборами параметрів каскаду.
+
+    Параметри:
+    img (numpy.array): Зображення BGR або у відтінках сірого.
+    params (list): Пари (scaleFactor, minNeighbors) для detectMultiScale.
+    max_candidates (int): Максимальна кількість прямокутників у результаті.
+    roi (tuple, optional): Область пошуку (x, y, w, h) у пікселях кадру.
+    min_size (tuple, optional): Мінімальний розмір номерного знаку (w, h).
+    max_size (tuple, optional): Максимальний розмір номерного знаку (w, h).
+
+    Повертає:
+    list: Прямокутники (x, y, w, h) за спаданням ваги виявлення каскадом.
+    """
+    region, (offset_x, offset_y) = _region(to_gray(img), roi)
+    weights = {}
+    for scale_factor, min_neighbors in params:
+        rects, _, level_weights = registry.cascade.detectMultiScale3(
+            region, scaleFactor=scale_factor, minNeighbors=min_neighbors, outputRejectLevels=True,
+            **_size_limits(1.0, min_size, max_size))
+        for (x, y, w, h), weight in zip(rects, np.ravel(level_weights)):
+            box = (int(x) + offset_x, int(y) + offset_y, int(w), int(h))
+            weights[box] = max(weights.get(box, float('-inf')), float(weight))
+    return sorted(weights, key=weights.get, reverse=True)[:max_candidates]
+
+
+def iou(a, b) -> float:
+    """
+    Перетин над об'єднанням двох прямокутників (x, y, w, h).
+    """
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[0] + a[2], b[0] + b[2]), min(a[1] + a[3], b[1] + b[3])
+    intersection = max(0, x2 - x1) * max(0, y2 - y1)
+    union = a[2] * a[3] + b[2] * b[3] - intersection
+    return intersection / union if union else 0.0
+
+
+def suppress_nested(boxes, threshold: float = 0.7) -> list:
+    """
+    Відкидає вкладені виявлення одного номерного знаку.
+
+    Каскад часто знаходить той самий номерний знак кількома вкладеними прямокутниками;
+    якщо менший прямокутник більш ніж на threshold лежить усередині більшого,
+    залишається лише менший, щільніший прямокутник.
+
+    Параметри:
+    boxes (list): Прямокутники (x, y, w, h).
+    threshold (float): Мінімальна частка площі меншого прямокутника всередині більшого.
+
+    Повертає:
+    list: Прямокутники без вкладених дублікатів.
+    """
+    kept = []
+    for box in sorted(boxes, key=lambda b: b[2] * b[3]):
+        if all(overlap_of_smaller(box, other) < threshold for other in kept):
+            kept.append(box)
+    return kept
+
+
+def overlap_of_smaller(a, b) -> float:
+    """
+    Частка площі меншого з двох прямокутників (x, y, w, h), що лежить усередині іншого.
+    """
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[0] + a[2], b[0] + b[2]), min(a[1] + a[3], b[1] + b[3])
+    intersection = max(0, x2 - x1) * max(0, y2 - y1)
+    smaller = min(a[2] * a[3], b[2] * b[3])
+    return intersection / smaller if smaller else 0.0
+
+
+def crop_plate(img, box):
+    """
+    Вирізає копію області номерного знаку, щоб подальше малювання на кадрі її не змінювало.
+    """
+    x, y, w, h = box
+    return img[y:y+h, x:x+w, :].copy()
 
 
-def detect_plate(img, text=''): 
+def annotate_plates(img, boxes, text='', copy: bool = True):
+    """
+    Малює рамки навколо номерних знаків і, за бажанням, текст.
+
+    Параметри:
+    img (numpy.array): Вихідне зображення.
+    boxes (list): Прямокутники (x, y, w, h) номерних знаків.
+    text (str, optional): Текст у лівому верхньому куті.
+    copy (bool): Малювати на копії; False - малювати безпосередньо на img без копіювання кадру.
+
+    Повертає:
+    numpy.array: Зображення з рамками та текстом.
+    """
+    plate_img = img.copy() if copy else img
+    for (x, y, w, h) in boxes:
+        cv2.rectangle(plate_img, (x-15, y), (x+w-3, y+h-5), (179, 206, 226), 3)
+    if text != '':
+        plate_img = cv2.putText(plate_img, text, (15,15),
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2, cv2.LINE_AA)
+        plate_img = cv2.putText(plate_img, text, (15,15),
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 2, cv2.LINE_AA)
+    return plate_img
+
+
+def render_output(img, boxes, text='', output: OutputOptions = DEFAULT_OUTPUT, crop_box=None,
+                  timer: StageTimer = None, fitted=None) -> bytes:
+    """
+    Готує і кодує зображення-результат розпізнавання.
+
+    Кадр зменшується до output.max_size, і рамки малюються вже на зменшеній копії;
+    якщо кадр не зменшується, рамки малюються безпосередньо на img.
+
+    Параметри:
+    img (numpy.array): Кадр BGR.
+    boxes (list): Прямокутники (x, y, w, h) номерних знаків у координатах кадру.
+    text (str, optional): Текст у лівому верхньому куті.
+    output (OutputOptions): Формат, якість, розмір зображення та режим лише області номерного знаку.
+    crop_box (tuple, optional): Прямокутник номерного знаку для output.crop.
+    timer (StageTimer, optional): Вимірювач тривалості етапу encode.
+    fitted (concurrent.futures.Future, optional): Заздалегідь запущений fit_size(img, output.max_size).
+
+    Повертає:
+    bytes: Закодоване зображення.
+    """
+    with (timer or StageTimer()).span('encode'):
+        if output.crop and crop_box is not None:
+            x, y, w, h = crop_box
+            out, _ = fit_size(img[y:y+h, x:x+w], output.max_size)
+        else:
+            out, ratio = fitted.result() if fitted is not None else fit_size(img, output.max_size)
+            out = annotate_plates(out, [tuple(int(round(v * ratio)) for v in box) for box in boxes], text,
+                                  copy=False)
+        return encode_image(out, output)
+
+
+def detect_plate(img, text='', copy: bool = True, profile: CameraProfile = DEFAULT_PROFILE): 
     """
     Функція призначена для виявлення та обробки номерних знаків на зображенні.
     
     Параметри:
     img (numpy.array): Зображення, на якому потрібно виявити та обробити номерні знаки.
     text (str, optional): Текст, який можна додати на зображення навколо номерного знаку.
+    copy (bool): Малювати рамки на копії зображення; False - безпосередньо на img.
+    profile (CameraProfile, optional): Профіль камери з областю пошуку та параметрами каскаду.
     
     Повертає:
     numpy.array: Зображення з виділеними номерними знаками та, за бажанням, доданим текстом.
-    numpy.array or None: Зображення області номерного знаку для подальшої обробки або None, якщо номерний знак не був виявлений.
+    numpy.array or None: Зображення найбільшої виявленої області номерного знаку (найближчий до камери
+    автомобіль) для подальшої обробки або None, якщо номерний знак не був виявлений.
     """
-    plate_img = img.copy()  # Копіюємо вхідне зображення для обробки
-    roi = img.copy()  # Копіюємо вхідне зображення для виділення області номерного знаку
-    
     # Виявлення номерних знаків на зображенні
-    plate_rect = plate_cascade.detectMultiScale(plate_img, scaleFactor=1.3, minNeighbors=8)
+    plate_rect = find_plates(img, **profile.detection_args())
     
-    # Ініціалізуємо змінну plate перед використанням
-    plate = None
-    
-    # Обробка кожного виявленого номерного знаку
-    for (x, y, w, h) in plate_rect:
-        # Витягаємо область номерного знаку для подальшої обробки
-        roi_ = roi[y:y+h, x:x+w, :]
-        plate = roi[y:y+h, x:x+w, :]
-        
-        # Малюємо прямокутник навколо номерного знаку на вихідному зображенні
-        cv2.rectangle(plate_img, (x-15, y), (x+w-3, y+h-5), (179, 206, 226), 3)
-     
-    # Додавання тексту 
-    if text != '':
-        plate_img = cv2.putText(plate_img, text, (15,15),
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1, cv2.LINE_AA)
+    # Порядок прямокутників каскаду довільний, тож для подальшої обробки береться найбільша область
+    plate = crop_plate(img, max(plate_rect, key=lambda box: box[2] * box[3])) if plate_rect else None
     
+    # Малюємо прямокутники навколо номерних знаків та додаємо текст
+    plate_img = annotate_plates(img, plate_rect, text, copy=copy)
+            
     # Повертаємо оброблене зображення з виділеними номерними знаками та область номерного знаку
     return plate_img, plate
 
@@ -126,12 +337,56 @@ def find_contours(dimensions, img):
     return img_res
 
 
-def segment_characters(image):
+def find_components(dimensions, img, max_characters: int = 15):
+    """
+    Знаходить символи на бінарному зображенні номерного знака як зв'язні компоненти.
+
+    Альтернатива find_contours: компоненти знаходяться одним викликом
+    connectedComponentsWithStats, фільтруються векторно за розмірами з масиву статистик,
+    а символи записуються в один заздалегідь виділений масив.
+
+    Параметри:
+        dimensions (list): lower_width, upper_width, lower_height та upper_height контурів символів.
+        img (numpy.ndarray): Бінарне зображення номерного знака (темні символи на білому тлі).
+        max_characters (int): Максимальна кількість символів (найбільших за площею).
+
+    Повертає:
+        numpy.ndarray: Зображення символів з розмірами (N, 44, 24), відсортовані за координатою x.
+    """
+    inverted = cv2.subtract(255, img)
+    _, _, stats, _ = cv2.connectedComponentsWithStats(inverted, connectivity=4)
+    # Рамка контуру символу у find_contours проходить по пікселях тла навколо нього,
+    # тобто на 1 піксель ширша з кожного боку за рамку компоненти
+    x = stats[1:, cv2.CC_STAT_LEFT] - 1
+    y = stats[1:, cv2.CC_STAT_TOP] - 1
+    w = stats[1:, cv2.CC_STAT_WIDTH] + 2
+    h = stats[1:, cv2.CC_STAT_HEIGHT] + 2
+    lower_width, upper_width, lower_height, upper_height = dimensions
+    mask = (w > lower_width) & (w < upper_width) & (h > lower_height) & (h < upper_height)
+    selected = np.flatnonzero(mask)
+    if len(selected) > max_characters:
+        selected = selected[np.argsort(-stats[1:, cv2.CC_STAT_AREA][selected], kind='stable')[:max_characters]]
+    selected = selected[np.argsort(x[selected], kind='stable')]
+
+    chars = np.zeros((len(selected), 44, 24), dtype=np.float32)
+    for char, i in zip(chars, selected):
+        x0, y0 = max(0, x[i]), max(0, y[i])
+        char[2:42, 2:22] = cv2.resize(inverted[y0:y[i]+h[i], x0:x[i]+w[i]], (20, 40))
+    return chars
+
+
+SEGMENTERS = {'contours': find_contours, 'components': find_components}
+
+
+def segment_characters(image, threshold: int = None, bounds=None, segmenter: str = SEGMENTER):
     """
     Знаходить символи на зображенні номерного знака.
 
     Параметри:
      - image: Зображення номерного знака, з якого будуть вилучені символи.
+     - threshold: Поріг бінаризації; за замовчуванням поріг вибирається методом Оцу.
+     - bounds: Коефіцієнти розмірів контурів символів (WIDTH_LOWER, WIDTH_UPPER, HEIGH_LOWER, HEIGH_UPPER).
+     - segmenter: Спосіб пошуку символів: 'contours' (find_contours) або 'components' (find_components).
 
     Повертає:
      - char_list: Список контурів символів, знайдених на зображенні.
@@ -139,7 +394,10 @@ def segment_characters(image):
     # Попередньо оброблюємо зображення номерного знака
     img_lp = cv2.resize(image, (333, 75))
     img_gray_lp = cv2.cvtColor(img_lp, cv2.COLOR_BGR2GRAY)
-    _, img_binary_lp = cv2.threshold(img_gray_lp, 200, 255, cv2.THRESH_BINARY+cv2.THRESH_OTSU)
+    if threshold is None:
+        _, img_binary_lp = cv2.threshold(img_gray_lp, 200, 255, cv2.THRESH_BINARY+cv2.THRESH_OTSU)
+    else:
+        _, img_binary_lp = cv2.threshold(img_gray_lp, threshold, 255, cv2.THRESH_BINARY)
     img_binary_lp = cv2.erode(img_binary_lp, (3,3))
     img_binary_lp = cv2.dilate(img_binary_lp, (3,3))
 
@@ -153,13 +411,16 @@ def segment_characters(image):
     img_binary_lp[:,330:333] = 255
 
     # Приблизні розміри контурів символів обрізаного номерного знака
-    dimensions = [LP_WIDTH * WIDTH_LOWER,
-                  LP_WIDTH * WIDTH_UPPER,
-                  LP_HEIGHT * HEIGH_LOWER,
-                  LP_HEIGHT * HEIGH_UPPER]
+    width_lower, width_upper, heigh_lower, heigh_upper = bounds or (WIDTH_LOWER, WIDTH_UPPER, HEIGH_LOWER, HEIGH_UPPER)
+    dimensions = [LP_WIDTH * width_lower,
+                  LP_WIDTH * width_upper,
+                  LP_HEIGHT * heigh_lower,
+                  LP_HEIGHT * heigh_upper]
 
 
-    char_list = find_contours(dimensions, img_binary_lp)
+    if segmenter not in SEGMENTERS:
+        raise ValueError(f'Невідомий спосіб сегментації символів: {segmenter}')
+    char_list = SEGMENTERS[segmenter](dimensions, img_binary_lp)
 
     return char_list
 
@@ -168,17 +429,80 @@ def segment_characters(image):
 def fix_dimension(img):
     """
     Функція для вирівнювання розмірів зображення до розмірів (28, 28, 3).
+    Працює як з одним зображенням, так і з пакетом зображень.
 
     Параметри:
-    img (numpy.ndarray): Вхідне зображення з розмірами (n, m), де n та m - цілі числа.
+    img (numpy.ndarray): Вхідне зображення з розмірами (n, m) або пакет з розмірами (N, n, m).
 
     Повертає:
-    numpy.ndarray: Зображення з розмірами (28, 28, 3), де 3 - кількість каналів (RGB).
+    numpy.ndarray: Зображення з розмірами (28, 28, 3) або пакет (N, 28, 28, 3), де 3 - кількість каналів (RGB).
     """
-    new_img = np.zeros((28,28,3))
-    for i in range(3):
-        new_img[:,:,i] = img
-    return new_img
+    return np.repeat(np.asarray(img)[..., np.newaxis], 3, axis=-1)
+
+
+def prepare_characters(char):
+    """
+    Готує зображення символів номерного знаку до класифікації одним пакетом.
+
+    Параметри:
+    char (list): Список зображень символів номерного знаку.
+
+    Повертає:
+    numpy.ndarray: Пакет зображень з розмірами (N, 28, 28, 3).
+    """
+    if len(char) == 0:
+        return np.zeros((0, 28, 28, 3), dtype=np.float32)
+    batch = np.stack([cv2.resize(ch, (28, 28), interpolation=cv2.INTER_AREA) for ch in char])
+    return fix_dimension(batch.astype(np.float32))
+
+
+def character_probabilities(char, temperature: float = CONFIDENCE_TEMPERATURE):
+    """
+    Класифікує всі символи номерного знаку за один прохід моделі.
+
+    Параметри:
+    char (list): Список зображень символів номерного знаку.
+    temperature (float): Температура калібрування ймовірностей (1 - ймовірності моделі без змін).
+
+    Повертає:
+    numpy.ndarray: Ймовірності класів для кожного символу з розмірами (N, len(CHARACTERS)).
+    """
+    batch = prepare_characters(char)
+    if len(batch) == 0:
+        return np.zeros((0, len(CHARACTERS)), dtype=np.float32)
+    return temperature_scale(np.asarray(registry.classifier.predict_on_batch(batch)), temperature)
+
+
+def character_probabilities_batch(char_lists):
+    """
+    Класифікує символи кількох номерних знаків за один прохід моделі.
+
+    Параметри:
+    char_lists (list): Списки зображень символів для кожного номерного знаку.
+
+    Повертає:
+    list: Масиви ймовірностей символів для кожного номерного знаку.
+    """
+    proba = character_probabilities([ch for char in char_lists for ch in char])
+    bounds = np.cumsum([len(char) for char in char_lists])[:-1]
+    return np.split(proba, bounds)
+
+
+def predict_characters(char):
+    """
+    Розпізнає символи номерного знаку та повертає ймовірність кожного з них.
+
+    Параметри:
+    char (list): Список зображень символів номерного знаку.
+
+    Повертає:
+    str: Рядок, що містить розпізнаний номерний знак.
+    numpy.ndarray: Ймовірність вибраного класу для кожного символу.
+    """
+    y_proba = character_probabilities(char)
+    y_ = np.argmax(y_proba, axis=1) # вибираємо клас з найвищою ймовірністю для кожного символу
+    plate_number = ''.join(CHARACTERS[i] for i in y_) # об'єднуємо всі символи у рядок
+    return plate_number, y_proba[np.arange(len(y_)), y_]
 
 
 def show_results(char):
@@ -191,52 +515,286 @@ def show_results(char):
     Повертає:
     str: Рядок, що містить розпізнану номерну знаку, складену з окремих символів.
     """
-    dic = {}
-    characters = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-    for i, c in enumerate(characters):
-        dic[i] = c
+    plate_number, _ = predict_characters(char)
+    return plate_number
 
-    output = []
-    for i, ch in enumerate(char): # ітеруємося по символах
-        img_ = cv2.resize(ch, (28, 28), interpolation=cv2.INTER_AREA)
-        img = fix_dimension(img_)
-        img = img.reshape(1, 28, 28, 3) # підготовка зображення для моделі
-        y_proba = model.predict(img, verbose=0)[0] # отримуємо ймовірності для кожного класу
-        y_ = np.argmax(y_proba) # вибираємо клас з найвищою ймовірністю
-        character = dic[y_] # отримуємо символ, відповідний прогнозованому класу
-        output.append(character) # зберігаємо результат у списку
 
-    plate_number = ''.join(output) # об'єднуємо всі символи у рядок
+def plate_confidence(probabilities):
+    """
+    Впевненість у розпізнаному номері - добуток ймовірностей його символів.
 
-    return plate_number
+    Параметри:
+    probabilities (numpy.ndarray): Ймовірність вибраного класу для кожного символу.
 
+    Повертає:
+    float: Впевненість від 0 до 1 (0, якщо символи не знайдено).
+    """
+    return float(np.prod(probabilities)) if len(probabilities) else 0.0
 
-def plate_recognize(photo):
+
+def read_plate(plate):
     """
-    Розпізнавання номерного знаку на зображенні.
+    Розпізнає символи на вирізаному зображенні номерного знаку.
 
-    :param photo: Шлях до зображення автомобіля з номерним знаком.
-    :type photo: str
-    :return: Кортеж, що містить зображення з рамкою навколо номерного знаку та розпізнані символи.
+    Параметри:
+    plate (numpy.array): Зображення області номерного знаку.
+
+    Повертає:
+    str: Розпізнані символи.
+    float: Впевненість - добуток ймовірностей символів (0, якщо символи не знайдено).
+    """
+    char = segment_characters(plate)
+    recognized_symbols, probabilities = predict_characters(char)
+    return recognized_symbols, plate_confidence(probabilities)
+
+
+def load_image(photo):
+    """
+    Завантажує зображення з файлу або декодує його безпосередньо з буфера в пам'яті.
+
+    Параметри:
+    photo (str | os.PathLike | bytes | bytearray | memoryview): Шлях до зображення,
+        його вміст або об'єкт з методом read().
+
+    Повертає:
+    numpy.ndarray: Зображення у форматі BGR.
+    """
+    if isinstance(photo, (str, os.PathLike)):
+        img = cv2.imread(os.fspath(photo))
+    else:
+        if hasattr(photo, 'read'):
+            photo = photo.read()
+        img = cv2.imdecode(np.frombuffer(photo, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        raise ValueError('Не вдалося прочитати зображення')
+    return img
+
+
+def read_plate_candidates(img, boxes, thresholds=SLOW_THRESHOLDS, bounds=None, segmenter: str = SEGMENTER):
+    """
+    Розпізнає кілька варіантів номерного знаку і вибирає найвпевненіший.
+
+    Для кожного прямокутника символи виділяються з кожним порогом бінаризації,
+    і всі символи всіх варіантів класифікуються одним пакетом.
+
+    Параметри:
+    img (numpy.array): Зображення автомобіля.
+    boxes (list): Прямокутники (x, y, w, h) номерних знаків.
+    thresholds (list): Пороги бінаризації; None - метод Оцу.
+    bounds (tuple, optional): Коефіцієнти розмірів контурів символів.
+    segmenter (str): Спосіб пошуку символів ('contours' або 'components').
+
+    Повертає:
+    tuple: Прямокутник, розпізнані символи та впевненість найкращого варіанту або None, якщо boxes порожній.
+    """
+    variants = [(box, threshold) for box in boxes for threshold in thresholds]
+    if not variants:
+        return None
+    char_lists = [segment_characters(img[y:y+h, x:x+w, :], threshold=threshold, bounds=bounds,
+                                     segmenter=segmenter)
+                  for (x, y, w, h), threshold in variants]
+    best = None
+    for (box, _), y_proba in zip(variants, character_probabilities_batch(char_lists)):
+        y_ = np.argmax(y_proba, axis=1)
+        candidate = (box, ''.join(CHARACTERS[i] for i in y_), plate_confidence(y_proba[np.arange(len(y_)), y_]))
+        if best is None or _candidate_rank(candidate) > _candidate_rank(best):
+            best = candidate
+    return best
+
+
+def read_plates(img, boxes, profile: CameraProfile = DEFAULT_PROFILE, nested_threshold: float = 0.7,
+                timer: StageTimer = None):
+    """
+    Розпізнає всі виявлені номерні знаки зображення.
+
+    Символи всіх прямокутників класифікуються одним пакетом. Прочитання впорядковуються
+    за відповідністю граматиці номерних знаків, а потім за впевненістю; з вкладених
+    прямокутників одного номерного знаку залишається найкраще прочитання.
+
+    Параметри:
+    img (numpy.array): Зображення автомобілів.
+    boxes (list): Прямокутники (x, y, w, h) номерних знаків.
+    profile (CameraProfile): Профіль камери з параметрами сегментації.
+    nested_threshold (float): Частка площі меншого прямокутника всередині більшого,
+        за якої прямокутники вважаються одним номерним знаком.
+    timer (StageTimer, optional): Вимірювач тривалості етапів segment і classify.
+
+    Повертає:
+    list: Словники {'box', 'plate', 'confidence', 'grammar'} від найкращого прочитання.
+    """
+    if not boxes:
+        return []
+    timer = timer or StageTimer()
+    with timer.span('segment'):
+        char_lists = [segment_characters(img[y:y+h, x:x+w, :], **profile.segmentation_args())
+                      for (x, y, w, h) in boxes]
+    with timer.span('classify'):
+        probabilities = character_probabilities_batch(char_lists)
+    plates = []
+    for box, y_proba in zip(boxes, probabilities):
+        y_ = np.argmax(y_proba, axis=1)
+        plate = ''.join(CHARACTERS[i] for i in y_)
+        plates.append({'box': tuple(int(v) for v in box), 'plate': plate,
+                       'confidence': plate_confidence(y_proba[np.arange(len(y_)), y_]) if len(y_) else None,
+                       'grammar': grammar_score(plate)})
+    plates.sort(key=lambda result: plate_rank(result['plate'], result['confidence']), reverse=True)
+    kept = []
+    for result in plates:
+        if all(overlap_of_smaller(result['box'], other['box']) < nested_threshold for other in kept):
+            kept.append(result)
+    return kept
+
+
+def _candidate_rank(candidate):
+    # Добуток ймовірностей завжди більший для коротшого номера, тож спершу порівнюється
+    # допустимість довжини, а вже потім впевненість
+    _, recognized_symbols, confidence = candidate
+    return len(recognized_symbols or '') in PLATE_LENGTHS, confidence
+
+
+def _best_read(plates):
+    # Найкраще прочитання read_plates у вигляді (прямокутник, символи, впевненість)
+    if not plates:
+        return None, None, None
+    best = plates[0]
+    return best['box'], best['plate'], best['confidence'] or 0.0
+
+
+def _recognize_tiered(img, timer: StageTimer, profile: CameraProfile):
+    """
+    Дворівневе розпізнавання: швидкий прохід і, за низької впевненості, повільний.
+
+    Повертає:
+    tuple: Прямокутник номерного знаку, розпізнані символи та впевненість або (None, None, None).
+    """
+    # Швидкий прохід: пошук на зменшеному зображенні з фіксованими параметрами каскаду
+    with timer.span('detect'):
+        boxes = find_plates(img, **profile.detection_args(max_width=profile.fast_max_width))
+    result = _best_read(read_plates(img, boxes, profile, timer=timer))
+    if result[2] is not None and result[2] >= profile.fast_min_confidence and len(result[1]) in PLATE_LENGTHS:
+        return result
+
+    # Повільний прохід: кілька наборів параметрів каскаду на повному зображенні,
+    # кілька кандидатів і порогів бінаризації
+    with timer.span('slow'):
+        boxes = find_plate_candidates(img, roi=profile.roi, min_size=profile.min_plate_size,
+                                      max_size=profile.max_plate_size)
+        candidate = read_plate_candidates(img, boxes, bounds=profile.char_bounds, segmenter=profile.segmenter)
+    if candidate is not None and (result[2] is None or _candidate_rank(candidate) > _candidate_rank(result)):
+        return candidate
+    return result
+
+
+def recognize_plate(photo, timings: dict = None, mode: str = RECOGNITION_MODE,
+                    profile: CameraProfile = DEFAULT_PROFILE, output: OutputOptions = DEFAULT_OUTPUT):
+    """
+    Розпізнавання номерного знаку на зображенні з оцінкою впевненості.
+
+    :param photo: Шлях до зображення автомобіля з номерним знаком або вміст зображення (bytes).
+    :type photo: str | bytes
+    :param timings: Словник, у який записується тривалість кожного етапу у секундах
+                    (decode, detect, encode, segment, classify, total; slow - для повільного проходу).
+    :type timings: dict, optional
+    :param mode: 'single' - один прохід з фіксованими параметрами;
+                 'tiered' - швидкий прохід на зменшеному зображенні, а за впевненості нижче
+                 FAST_MIN_CONFIDENCE або довжини номера не з PLATE_LENGTHS - повільний прохід
+                 з кількома кандидатами.
+    :type mode: str
+    :param profile: Профіль камери: область пошуку, розміри номерного знаку та параметри.
+    :type profile: CameraProfile
+    :param output: Формат, якість і розмір зображення-результату.
+    :type output: OutputOptions
+    :return: Зображення з рамкою навколо номерного знаку, розпізнані символи та відкалібрована
+             впевненість (добуток ймовірностей символів) або None, якщо номерний знак не виявлено.
+             Якщо в кадрі кілька номерних знаків, повертається найкраще прочитання (див. read_plates).
     :rtype: tuple
+    :raises ValueError: Якщо зображення не вдалося прочитати або декодувати, або mode невідомий.
     """
-    img = cv2.imread(photo)
+    if mode not in ('single', 'tiered'):
+        raise ValueError(f'Невідомий режим розпізнавання: {mode}')
+    timer = StageTimer(timings)
+    with timer.span('total'):
+        with timer.span('decode'):
+            img = load_image(photo)
 
-    # Поточні час і дата
-    current_datetime = datetime.now()
-    current_datetime_str = current_datetime.strftime("%Y-%m-%d %H:%M:%S")
+        # Поточні час і дата
+        current_datetime = datetime.now()
+        current_datetime_str = current_datetime.strftime("%Y-%m-%d %H:%M:%S")
 
-    # Виявлення номерного знаку на зображенні
-    output_img, plate = detect_plate(img, text=current_datetime_str)
-    
-    # Переведення зображення у вибраний формат
-    _, img_buffer = cv2.imencode(f'.{OUTPUT_FORMAT}', output_img)
-    img_bytes = img_buffer.tobytes()
+        if mode == 'tiered':
+            # Рамка відома лише після розпізнавання, тож у фоновому потоці заздалегідь
+            # зменшується кадр для зображення-результату
+            fitted = None if output.crop else submit(fit_size, img, output.max_size)
+            box, recognized_symbols, confidence = _recognize_tiered(img, timer, profile)
+            img_bytes = render_output(img, [box] if box else [], current_datetime_str, output, box, timer, fitted)
+            return img_bytes, recognized_symbols, confidence
 
-    if plate is None:
-        return img_bytes, None
-    
-    char = segment_characters(plate)# Виявлення символів номерного знаку
-    recognized_symbols = show_results(char)# Розпізнавання символів номерного знаку
+        # Зменшення кадру для зображення-результату у фоновому потоці одночасно з розпізнаванням
+        fitted = None if output.crop else submit(fit_size, img, output.max_size)
+
+        # Виявлення номерних знаків на зображенні
+        with timer.span('detect'):
+            boxes = find_plates(img, **profile.detection_args())
+
+        # Розпізнаються всі виявлені області, і повертається найкраще прочитання
+        box, recognized_symbols, confidence = _best_read(read_plates(img, boxes, profile, timer=timer))
+        img_bytes = render_output(img, boxes, current_datetime_str, output, box, timer, fitted)
 
-    return img_bytes, recognized_symbols
\ No newline at end of file
+    return img_bytes, recognized_symbols, confidence
+
+
+def recognize_plates(photo, timings: dict = None, profile: CameraProfile = DEFAULT_PROFILE,
+                     output: OutputOptions = DEFAULT_OUTPUT):
+    """
+    Розпізнавання всіх номерних знаків на зображенні, наприклад з камери, що охоплює дві смуги.
+
+    :param photo: Шлях до зображення або його вміст (bytes).
+    :type photo: str | bytes
+    :param timings: Словник, у який записується тривалість кожного етапу у секундах
+                    (decode, detect, segment, classify, encode, total).
+    :type timings: dict, optional
+    :param profile: Профіль камери.
+    :type profile: CameraProfile
+    :param output: Формат, якість і розмір зображення-результату (output.crop - область найкращого прочитання).
+    :type output: OutputOptions
+    :return: Зображення з рамками навколо всіх номерних знаків і список прочитань
+             (див. read_plates) від найкращого.
+    :rtype: tuple
+    :raises ValueError: Якщо зображення не вдалося прочитати або декодувати.
+    """
+    timer = StageTimer(timings)
+    with timer.span('total'):
+        with timer.span('decode'):
+            img = load_image(photo)
+        current_datetime_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        fitted = None if output.crop else submit(fit_size, img, output.max_size)
+        with timer.span('detect'):
+            boxes = find_plates(img, **profile.detection_args())
+        plates = read_plates(img, boxes, profile, timer=timer)
+        img_bytes = render_output(img, [result['box'] for result in plates], current_datetime_str, output,
+                                  plates[0]['box'] if plates else None, timer, fitted)
+    return img_bytes, plates
+
+
+def plate_recognize(photo, timings: dict = None, mode: str = RECOGNITION_MODE,
+                    profile: CameraProfile = DEFAULT_PROFILE, output: OutputOptions = DEFAULT_OUTPUT):
+    """
+    Розпізнавання номерного знаку на зображенні.
+
+    :param photo: Шлях до зображення автомобіля з номерним знаком або вміст зображення (bytes).
+    :type photo: str | bytes
+    :param timings: Словник, у який записується тривалість кожного етапу у секундах
+                    (decode, detect, encode, segment, classify, total).
+    :type timings: dict, optional
+    :param mode: Режим розпізнавання ('single' або 'tiered'), див. recognize_plate.
+    :type mode: str
+    :param profile: Профіль камери.
+    :type profile: CameraProfile
+    :param output: Формат, якість і розмір зображення-результату.
+    :type output: OutputOptions
+    :return: Кортеж, що містить зображення з рамкою навколо номерного знаку та розпізнані символи.
+    :rtype: tuple
+    :raises ValueError: Якщо зображення не вдалося прочитати або декодувати.
+    """
+    img_bytes, recognized_symbols, _ = recognize_plate(photo, timings, mode, profile, output)
+    return img_bytes, recognized_symbols
@@ -0,0 +1,116 @@
+import numpy as np
+
+from .configures import MODEL, MODEL_TFLITE, MODEL_ONNX
+
+
+class KerasBackend:
+    """
+    Класифікатор символів на повному TensorFlow/Keras.
+    """
+
+    def __init__(self, path: str = MODEL):
+        from keras.models import load_model
+
+        self.model = load_model(path, compile=False)
+
+    def predict_on_batch(self, batch):
+        """
+        Класифікує пакет символів.
+
+        Параметри:
+        batch (numpy.ndarray): Пакет зображень символів з розмірами (N, 28, 28, 3).
+
+        Повертає:
+        numpy.ndarray: Ймовірності класів з розмірами (N, len(CHARACTERS)).
+        """
+        return np.asarray(self.model.predict_on_batch(batch))
+
+
+class TFLiteBackend:
+    """
+    Класифікатор символів на TensorFlow Lite.
+
+    Використовує легкий пакет tflite-runtime, а якщо його немає - tf.lite з TensorFlow.
+    """
+
+    def __init__(self, path: str = MODEL_TFLITE):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+
+            Interpreter = tf.lite.Interpreter
+
+        self.interpreter = Interpreter(model_path=path)
+        self._input = self.interpreter.get_input_details()[0]['index']
+        self._output = self.interpreter.get_output_details()[0]['index']
+        self._batch_size = None
+
+    def predict_on_batch(self, batch):
+        """
+        Класифікує пакет символів.
+
+        Параметри:
+        batch (numpy.ndarray): Пакет зображень символів з розмірами (N, 28, 28, 3).
+
+        Повертає:
+        numpy.ndarray: Ймовірності класів з розмірами (N, len(CHARACTERS)).
+        """
+        batch = np.ascontiguousarray(batch, dtype=np.float32)
+        # Тензори перевиділяються лише при зміні розміру пакету
+        if batch.shape[0] != self._batch_size:
+            self.interpreter.resize_tensor_input(self._input, batch.shape)
+            self.interpreter.allocate_tensors()
+            self._batch_size = batch.shape[0]
+        self.interpreter.set_tensor(self._input, batch)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self._output).copy()
+
+
+class OnnxBackend:
+    """
+    Класифікатор символів на ONNX Runtime.
+    """
+
+    def __init__(self, path: str = MODEL_ONNX):
+        import onnxruntime
+
+        self.session = onnxruntime.InferenceSession(path, providers=['CPUExecutionProvider'])
+        self._input = self.session.get_inputs()[0].name
+
+    def predict_on_batch(self, batch):
+        """
+        Класифікує пакет символів.
+
+        Параметри:
+        batch (numpy.ndarray): Пакет зображень символів з розмірами (N, 28, 28, 3).
+
+        Повертає:
+        numpy.ndarray: Ймовірності класів з розмірами (N, len(CHARACTERS)).
+        """
+        return self.session.run(None, {self._input: np.asarray(batch, dtype=np.float32)})[0]
+
+
+BACKENDS = {
+    'keras': KerasBackend,
+    'tflite': TFLiteBackend,
+    'onnx': OnnxBackend,
+}
+
+
+def load_backend(name: str = 'keras', path: str = None):
+    """
+    Створює класифікатор символів для вибраного середовища виконання.
+
+    Параметри:
+    name (str): Назва бекенду: 'keras', 'tflite' або 'onnx'.
+    path (str, optional): Шлях до файлу моделі; за замовчуванням - шлях з configures.
+
+    Повертає:
+    object: Класифікатор з методом predict_on_batch.
+    """
+    try:
+        backend = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Невідомий бекенд '{name}', доступні: {', '.join(BACKENDS)}")
+    return backend(path) if path else backend()
@@ -0,0 +1,184 @@
+import itertools
+import queue
+import time
+
+import numpy as np
+
+from .configures import BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS, BATCH_RESPONSE_TIMEOUT, INFERENCE_BACKEND, WARMUP_RUNS
+
+
+def _serve(requests, responses, backend, max_batch_size, max_wait_ms, warmup_runs):
+    """
+    Головний цикл процесу-сервера класифікації символів.
+
+    Чекає на перший запит, після чого збирає запити інших робочих процесів, доки
+    пакет не досягне max_batch_size символів або не мине max_wait_ms мілісекунд.
+    Зібраний пакет класифікується одним проходом моделі, а кожен запит отримує
+    свою частину результату у чергу свого робочого процесу.
+
+    Параметри:
+    requests (multiprocessing.Queue): Спільна черга запитів (slot, request_id, batch).
+    responses (list): Черги відповідей, по одній на робочий процес.
+    backend (str): Середовище виконання класифікатора ('keras', 'tflite' або 'onnx').
+    max_batch_size (int): Максимальна кількість символів у пакеті.
+    max_wait_ms (float): Максимальний час очікування на наповнення пакету.
+    warmup_runs (int): Кількість пробних проходів моделі перед обробкою запитів.
+    """
+    from .model_registry import registry
+
+    registry.configure(backend=backend)
+    registry.warm_up(warmup_runs, detector=False)
+    model = registry.classifier
+    stopping = False
+    while not stopping:
+        item = requests.get()
+        if item is None:
+            break
+        pending = [item]
+        size = len(item[2])
+        deadline = time.monotonic() + max_wait_ms / 1000
+        while size < max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = requests.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                stopping = True
+                break
+            pending.append(item)
+            size += len(item[2])
+
+        try:
+            y_proba = np.asarray(model.predict_on_batch(np.concatenate([x for _, _, x in pending])))
+        except Exception as e:
+            # Винятки Keras не завжди серіалізуються, тому передаємо лише текст помилки
+            for slot, request_id, _ in pending:
+                responses[slot].put((request_id, RuntimeError(f'Inference server error: {e}')))
+            continue
+
+        offset = 0
+        for slot, request_id, x in pending:
+            responses[slot].put((request_id, y_proba[offset:offset + len(x)]))
+            offset += len(x)
+
+
+class BatchingClassifier:
+    """
+    Замінник моделі Keras у робочому процесі розпізнавання.
+
+    Замість власного проходу моделі надсилає пакет символів серверу класифікації
+    і чекає на свою частину спільного пакету не довше timeout секунд.
+    """
+
+    def __init__(self, requests, responses, slot: int, timeout: float = BATCH_RESPONSE_TIMEOUT):
+        self.requests = requests
+        self.responses = responses
+        self.slot = slot
+        self.timeout = timeout
+        self._request_ids = itertools.count()
+
+    def predict_on_batch(self, batch):
+        """
+        Класифікує пакет символів на сервері.
+
+        Параметри:
+        batch (numpy.ndarray): Пакет зображень символів з розмірами (N, 28, 28, 3).
+
+        Повертає:
+        numpy.ndarray: Ймовірності класів з розмірами (N, len(CHARACTERS)).
+
+        Raises:
+        RuntimeError: Якщо сервер не відповів протягом timeout секунд (наприклад, його процес завершився).
+        """
+        request_id = next(self._request_ids)
+        self.requests.put((self.slot, request_id, np.asarray(batch, dtype=np.float32)))
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                response_id, result = self.responses.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                raise RuntimeError(f'Inference server did not respond within {self.timeout} s') from None
+            # Відповіді на запити, що завершились помилкою раніше, пропускаємо
+            if response_id == request_id:
+                break
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class InferenceServer:
+    """
+    Процес, що збирає символи з усіх запитів розпізнавання у спільні пакети.
+
+    Кожен робочий процес отримує власний слот - номер черги відповідей.
+    """
+
+    def __init__(self, workers: int, mp_context, backend: str = INFERENCE_BACKEND,
+                 max_batch_size: int = BATCH_MAX_SIZE, max_wait_ms: float = BATCH_MAX_WAIT_MS,
+                 warmup_runs: int = WARMUP_RUNS, response_timeout: float = BATCH_RESPONSE_TIMEOUT):
+        self.response_timeout = response_timeout
+        self.requests = mp_context.Queue()
+        self.responses = [mp_context.Queue() for _ in range(workers)]
+        self.slots = mp_context.Queue()
+        for slot in range(workers):
+            self.slots.put(slot)
+        self._process = mp_context.Process(
+            target=_serve,
+            args=(self.requests, self.responses, backend, max_batch_size, max_wait_ms, warmup_runs),
+            daemon=True,
+        )
+
+    def start(self):
+        self._process.start()
+
+    def is_alive(self) -> bool:
+        """
+        Перевіряє, чи працює процес-сервер.
+        """
+        return self._process.is_alive()
+
+    @property
+    def exitcode(self):
+        """
+        Код завершення процесу-сервера або None, якщо він ще працює.
+        """
+        return self._process.exitcode
+
+    def client_args(self) -> tuple:
+        """
+        Повертає аргументи для connect у робочих процесах.
+        """
+        return self.requests, self.responses, self.slots, self.response_timeout
+
+    def stop(self, timeout: float = 5):
+        """
+        Зупиняє процес-сервер.
+
+        Параметри:
+        timeout (float): Час очікування на завершення процесу, після якого він примусово зупиняється.
+        """
+        if self._process.is_alive():
+            self.requests.put(None)
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+
+
+def connect(requests, responses, slots, timeout: float = BATCH_RESPONSE_TIMEOUT) -> BatchingClassifier:
+    """
+    Створює клієнта сервера класифікації у робочому процесі.
+
+    Параметри:
+    requests (multiprocessing.Queue): Спільна черга запитів.
+    responses (list): Черги відповідей робочих процесів.
+    slots (multiprocessing.Queue): Черга вільних слотів.
+    timeout (float): Найдовше очікування на відповідь сервера у секундах.
+
+    Повертає:
+    BatchingClassifier: Клієнт з інтерфейсом predict_on_batch.
+    """
+    slot = slots.get()
+    return BatchingClassifier(requests, responses[slot], slot, timeout)
@@ -0,0 +1,116 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Межі кошиків гістограм затримки, у секундах
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class StageTimer:
+    """
+    Вимірювач тривалості етапів конвеєра.
+
+    Використовує time.perf_counter, тож накладні витрати - частки мікросекунди на етап,
+    і вимірювання можна залишати увімкненими у робочому середовищі.
+    """
+
+    def __init__(self, timings: dict = None):
+        self.timings = timings if timings is not None else {}
+
+    @contextmanager
+    def span(self, stage: str):
+        """
+        Вимірює тривалість блоку коду та додає її до етапу stage.
+
+        Параметри:
+        stage (str): Назва етапу.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] = self.timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+class Histogram:
+    """
+    Гістограма з фіксованими кошиками у стилі Prometheus.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        """
+        Повертає кумулятивні лічильники кошиків, кількість, суму та середнє значення.
+        """
+        cumulative, buckets = 0, {}
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            buckets['+Inf' if bound == float('inf') else str(bound)] = cumulative
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else None,
+            'buckets': buckets,
+        }
+
+
+class MetricsRegistry:
+    """
+    Реєстр гістограм затримки етапів розпізнавання за результатом (outcome).
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, outcome: str, seconds: float):
+        """
+        Додає вимір тривалості етапу.
+
+        Параметри:
+        stage (str): Назва етапу.
+        outcome (str): Результат розпізнавання, наприклад 'recognized' або 'unrecognized'.
+        seconds (float): Тривалість у секундах.
+        """
+        with self._lock:
+            histogram = self._histograms.get((stage, outcome))
+            if histogram is None:
+                histogram = self._histograms[(stage, outcome)] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def observe_timings(self, timings: dict, outcome: str):
+        """
+        Додає виміри всіх етапів одного запиту.
+
+        Параметри:
+        timings (dict): Тривалість кожного етапу у секундах.
+        outcome (str): Результат розпізнавання.
+        """
+        for stage, seconds in timings.items():
+            self.observe(stage, outcome, seconds)
+
+    def snapshot(self) -> dict:
+        """
+        Повертає стан усіх гістограм: {етап: {результат: гістограма}}.
+        """
+        with self._lock:
+            result = {}
+            for (stage, outcome), histogram in sorted(self._histograms.items()):
+                result.setdefault(stage, {})[outcome] = histogram.snapshot()
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
@@ -0,0 +1,118 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from .configures import CASCADE_ClASIFIER, INFERENCE_BACKEND, MIN_NEIGHBORS, SCALE_FACTOR, WARMUP_RUNS
+from .inference_backend import load_backend
+
+
+class ModelRegistry:
+    """
+    Реєстр моделей розпізнавання з відкладеним завантаженням.
+
+    Каскад Хаара та класифікатор символів завантажуються під час першого звернення,
+    тому імпорт модулів конвеєра не тягне за собою TensorFlow.
+    """
+
+    def __init__(self, backend: str = INFERENCE_BACKEND):
+        self.backend = backend
+        self.warmed_up = False
+        self.load_seconds = {}
+        self._cascade = None
+        self._classifier = None
+        self._lock = threading.Lock()
+
+    def configure(self, backend: str = None, classifier=None):
+        """
+        Змінює середовище виконання класифікатора або підставляє готовий класифікатор.
+
+        Параметри:
+        backend (str, optional): Середовище виконання ('keras', 'tflite' або 'onnx').
+        classifier (object, optional): Об'єкт з методом predict_on_batch, наприклад клієнт InferenceServer.
+        """
+        with self._lock:
+            if backend is not None and backend != self.backend:
+                self.backend = backend
+                self._classifier = None
+            if classifier is not None:
+                self._classifier = classifier
+            self.warmed_up = False
+
+    @property
+    def cascade(self):
+        """
+        Каскад Хаара для виявлення номерних знаків.
+        """
+        if self._cascade is None:
+            with self._lock:
+                if self._cascade is None:
+                    start = time.perf_counter()
+                    cascade = cv2.CascadeClassifier(CASCADE_ClASIFIER)
+                    if cascade.empty():
+                        raise RuntimeError(f'Не вдалося завантажити каскад {CASCADE_ClASIFIER}')
+                    self.load_seconds['cascade'] = round(time.perf_counter() - start, 3)
+                    self._cascade = cascade
+        return self._cascade
+
+    @property
+    def classifier(self):
+        """
+        Класифікатор символів з методом predict_on_batch.
+        """
+        if self._classifier is None:
+            with self._lock:
+                if self._classifier is None:
+                    start = time.perf_counter()
+                    classifier = load_backend(self.backend)
+                    self.load_seconds['classifier'] = round(time.perf_counter() - start, 3)
+                    self._classifier = classifier
+        return self._classifier
+
+    def load(self, detector: bool = True):
+        """
+        Примусово завантажує моделі.
+
+        Параметри:
+        detector (bool): Завантажувати також каскад Хаара.
+        """
+        if detector:
+            self.cascade
+        self.classifier
+
+    def warm_up(self, runs: int = WARMUP_RUNS, detector: bool = True):
+        """
+        Виконує пробні проходи моделей, щоб перший справжній запит не платив за ініціалізацію.
+
+        Параметри:
+        runs (int): Кількість пробних проходів; 0 - лише завантаження моделей.
+        detector (bool): Прогрівати також каскад Хаара.
+        """
+        self.load(detector)
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        batch = np.zeros((8, 28, 28, 3), dtype=np.float32)
+        for _ in range(runs):
+            if detector:
+                self.cascade.detectMultiScale(frame, scaleFactor=SCALE_FACTOR, minNeighbors=MIN_NEIGHBORS)
+            self.classifier.predict_on_batch(batch)
+        self.warmed_up = runs > 0
+
+    def status(self) -> dict:
+        """
+        Повертає стан завантаження моделей.
+
+        Повертає:
+        dict: Бекенд, тип класифікатора, ознаки завантаження та прогріву, час завантаження.
+        """
+        return {
+            'backend': self.backend,
+            'classifier': type(self._classifier).__name__ if self._classifier is not None else None,
+            'cascade_loaded': self._cascade is not None,
+            'classifier_loaded': self._classifier is not None,
+            'warmed_up': self.warmed_up,
+            'load_seconds': dict(self.load_seconds),
+        }
+
+
+registry = ModelRegistry()
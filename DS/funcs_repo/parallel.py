@@ -0,0 +1,30 @@
+from concurrent.futures import FIRST_COMPLETED, wait
+
+
+def imap_unordered(pool, fn, iterable, max_pending: int):
+    """
+    Виконує fn для кожного елемента у пулі, повертаючи результати в міру готовності.
+
+    На відміну від pool.map, не читає весь вхідний потік наперед: одночасно в роботі
+    не більше max_pending задач, тож пам'ять не залежить від розміру набору даних.
+
+    Параметри:
+    pool (concurrent.futures.Executor): Пул процесів або потоків.
+    fn (callable): Функція, що приймає один елемент.
+    iterable (iterable): Вхідні елементи.
+    max_pending (int): Максимальна кількість задач у роботі.
+
+    Повертає:
+    generator: Результати fn у порядку завершення.
+    """
+    pending = set()
+    for item in iterable:
+        pending.add(pool.submit(fn, item))
+        if len(pending) >= max_pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
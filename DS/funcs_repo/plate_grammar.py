@@ -0,0 +1,165 @@
+"""
+Граматика українських номерних знаків і нечіткий пошук серед зареєстрованих номерів.
+
+Номерний знак має формат з PLATE_FORMATS (AA1234BB: код регіону, чотири цифри, серія),
+а літерами можуть бути лише латинські відповідники кириличних літер (PLATE_LETTERS).
+Оцінка відповідності формату відрізняє номерний знак від хибного виявлення
+(решітка радіатора, напис на кузові) і від прочитання з пропущеним або зайвим символом.
+
+Прочитання з помилкою в одному символі виправляється до найближчого зареєстрованого
+номера за відстанню Левенштейна; DeletionIndex знаходить його без перебору всіх номерів.
+"""
+from .configures import PLATE_FORMATS, PLATE_LETTERS
+
+# Кириличні літери номерних знаків і їхні латинські відповідники
+CYRILLIC_TO_LATIN = str.maketrans('АВСЕНІКМОРТХ', 'ABCEHIKMOPTX')
+# Символи, які класифікатор плутає: цифра на місці літери і навпаки
+DIGIT_FOR_LETTER = {'O': '0', 'D': '0', 'Q': '0', 'I': '1', 'L': '1', 'Z': '2', 'S': '5', 'G': '6', 'T': '7',
+                    'B': '8'}
+LETTER_FOR_DIGIT = {'0': 'O', '1': 'I', '4': 'A', '7': 'T', '8': 'B'}
+
+
+def edit_distance(a: str, b: str) -> int:
+    """
+    Відстань Левенштейна між двома рядками.
+    """
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def normalize_plate(plate: str) -> str:
+    """
+    Зводить номер до вигляду, у якому його повертає класифікатор: 'ка 7777-са' -> 'KA7777CA'.
+    """
+    return plate.upper().translate(CYRILLIC_TO_LATIN).replace(' ', '').replace('-', '')
+
+
+def _matches(char: str, kind: str) -> bool:
+    return char.isdigit() if kind == 'D' else char in PLATE_LETTERS
+
+
+def grammar_score(plate: str, formats=PLATE_FORMATS) -> float:
+    """
+    Частка символів номера, що відповідають найближчому формату тієї самої довжини.
+
+    Параметри:
+    plate (str): Розпізнаний номер.
+    formats (tuple): Формати номерних знаків.
+
+    Повертає:
+    float: Від 0 (немає формату такої довжини) до 1 (номер повністю відповідає формату).
+    """
+    if not plate:
+        return 0.0
+    scores = [sum(_matches(char, kind) for char, kind in zip(plate, fmt)) / len(fmt)
+              for fmt in formats if len(fmt) == len(plate)]
+    return max(scores, default=0.0)
+
+
+def is_valid_plate(plate: str, formats=PLATE_FORMATS) -> bool:
+    """
+    Перевіряє, чи номер повністю відповідає одному з форматів.
+    """
+    return grammar_score(plate, formats) == 1.0
+
+
+def plate_rank(plate: str, confidence: float) -> tuple:
+    """
+    Ключ сортування прочитань: спершу відповідність формату, потім впевненість.
+
+    Добуток ймовірностей символів завжди більший для коротшого номера, тож
+    впевненість порівнюється лише між прочитаннями з однаковою оцінкою формату.
+    """
+    return grammar_score(plate), confidence or 0.0
+
+
+def apply_grammar(plate: str, formats=PLATE_FORMATS) -> str:
+    """
+    Замінює схожі символи, що не відповідають формату: цифру на місці літери і навпаки ('KA77T7CA' -> 'KA7777CA').
+
+    Параметри:
+    plate (str): Розпізнаний номер.
+    formats (tuple): Формати номерних знаків.
+
+    Повертає:
+    str: Виправлений номер або plate без змін, якщо формату такої довжини немає.
+    """
+    candidates = [fmt for fmt in formats if len(fmt) == len(plate)]
+    if not candidates:
+        return plate
+    fmt = max(candidates, key=lambda f: sum(_matches(char, kind) for char, kind in zip(plate, f)))
+    return ''.join(char if _matches(char, kind)
+                   else (DIGIT_FOR_LETTER if kind == 'D' else LETTER_FOR_DIGIT).get(char, char)
+                   for char, kind in zip(plate, fmt))
+
+
+class DeletionIndex:
+    """
+    Індекс рядків для пошуку в малому радіусі відстані Левенштейна.
+
+    Кожен рядок зберігається під усіма варіантами, отриманими видаленням до max_distance
+    символів. Рядки на відстані не більше d мають спільний варіант з не більше ніж d
+    видаленнями з кожного, тож пошук - це кілька звернень до словника і перевірка
+    кількох кандидатів, незалежно від кількості рядків в індексі.
+    """
+
+    def __init__(self, items=(), max_distance: int = 1):
+        self.max_distance = max_distance
+        self._variants = {}
+        self._items = set()
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: str) -> bool:
+        return item in self._items
+
+    @staticmethod
+    def deletions(item: str, depth: int) -> set:
+        """
+        Рядок і всі рядки, отримані з нього видаленням до depth символів.
+        """
+        variants, frontier = {item}, {item}
+        for _ in range(depth):
+            frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+            variants |= frontier
+        return variants
+
+    def add(self, item: str):
+        if item in self._items:
+            return
+        self._items.add(item)
+        for variant in self.deletions(item, self.max_distance):
+            self._variants.setdefault(variant, set()).add(item)
+
+    def discard(self, item: str):
+        if item not in self._items:
+            return
+        self._items.discard(item)
+        for variant in self.deletions(item, self.max_distance):
+            bucket = self._variants.get(variant)
+            if bucket is not None:
+                bucket.discard(item)
+                if not bucket:
+                    del self._variants[variant]
+
+    def search(self, query: str, max_distance: int = None) -> list:
+        """
+        Рядки на відстані не більше max_distance (за замовчуванням - max_distance індексу) від query.
+
+        Повертає:
+        list: Пари (відстань, рядок), відсортовані за відстанню.
+        """
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        candidates = set()
+        for variant in self.deletions(query, max_distance):
+            candidates |= self._variants.get(variant, set())
+        found = ((edit_distance(query, item), item) for item in candidates)
+        return sorted(pair for pair in found if pair[0] <= max_distance)
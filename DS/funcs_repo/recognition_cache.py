@@ -0,0 +1,172 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from .configures import CACHE_SIZE, CACHE_TTL_SECONDS, CACHE_MAX_DISTANCE
+
+
+def dhash(img, hash_size: int = 8) -> int:
+    """
+    Різницевий перцептивний хеш (dHash) зображення у відтінках сірого.
+
+    Зображення зменшується до (hash_size + 1) x hash_size, і кожен біт хешу показує,
+    чи яскравіший піксель за свого сусіда праворуч. Хеш стійкий до шуму стиснення
+    та незначних змін освітлення, тож майже однакові кадри мають близькі хеші.
+
+    Параметри:
+    img (numpy.array): Зображення у відтінках сірого.
+    hash_size (int): Розмір сітки; довжина хешу - hash_size * hash_size біт.
+
+    Повертає:
+    int: Хеш зображення.
+    """
+    small = cv2.resize(img, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def content_hash(photo):
+    """
+    Хеш вмісту файлу зображення: однаковий лише для байт-у-байт однакових кадрів.
+
+    Параметри:
+    photo (str | bytes): Шлях до зображення або його вміст.
+
+    Повертає:
+    int: 64-бітний хеш або None, якщо файл не вдалося прочитати.
+    """
+    if not isinstance(photo, (bytes, bytearray, memoryview)):
+        try:
+            with open(photo, 'rb') as file:
+                photo = file.read()
+        except OSError:
+            return None
+    return int.from_bytes(hashlib.blake2b(photo, digest_size=8).digest(), 'big')
+
+
+def image_hash(photo, perceptual: bool = True):
+    """
+    Ключ кешу для зображення.
+
+    Перцептивний хеш обчислюється без повного декодування: JPEG декодується одразу
+    у зменшеному у 8 разів вигляді у відтінках сірого. Він описує весь кадр і не розрізняє
+    номерні знаки - два автомобілі в одній сцені мають однаковий хеш.
+
+    Параметри:
+    photo (str | bytes): Шлях до зображення або його вміст.
+    perceptual (bool): Перцептивний хеш; False - хеш вмісту файлу (content_hash).
+
+    Повертає:
+    int: Хеш зображення або None, якщо зображення не вдалося прочитати.
+    """
+    if not perceptual:
+        return content_hash(photo)
+    if isinstance(photo, (bytes, bytearray, memoryview)):
+        img = cv2.imdecode(np.frombuffer(photo, np.uint8), cv2.IMREAD_REDUCED_GRAYSCALE_8)
+    else:
+        img = cv2.imread(str(photo), cv2.IMREAD_REDUCED_GRAYSCALE_8)
+    if img is None:
+        return None
+    return dhash(img)
+
+
+class RecognitionCache:
+    """
+    LRU-кеш результатів розпізнавання з обмеженим часом життя записів.
+
+    Ключ - хеш кадру разом з ідентифікатором камери. За max_distance = 0 ключ - хеш вмісту
+    файлу, тож результат повертається лише для повторно надісланого того самого кадру.
+    За max_distance > 0 ключ - перцептивний хеш, і збігом вважається запис тієї ж камери
+    з відстанню Геммінга не більше max_distance; такий кадр може належати іншому автомобілю
+    в тій самій сцені, тому цей режим вмикається лише явно.
+    """
+
+    def __init__(self, max_size: int = CACHE_SIZE, ttl_seconds: float = CACHE_TTL_SECONDS,
+                 max_distance: int = CACHE_MAX_DISTANCE):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.max_distance = max_distance
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    @property
+    def perceptual(self) -> bool:
+        return self.max_distance > 0
+
+    def get(self, key: int, camera_id: str = None):
+        """
+        Шукає результат для кадру з точним або близьким хешем.
+
+        Параметри:
+        key (int): Перцептивний хеш кадру.
+        camera_id (str, optional): Ідентифікатор камери.
+
+        Повертає:
+        Збережений результат або None, якщо збігу немає.
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [candidate for candidate, (created, _) in self._entries.items()
+                       if now - created > self.ttl_seconds]
+            for candidate in expired:
+                del self._entries[candidate]
+            match = (camera_id, key) if (camera_id, key) in self._entries else None
+            if match is None and self.max_distance > 0:
+                # Лінійний пошук: кеш невеликий, а XOR і popcount коштують наносекунди
+                match = next((candidate for candidate in self._entries if candidate[0] == camera_id
+                              and (candidate[1] ^ key).bit_count() <= self.max_distance), None)
+            if match is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(match)
+            self.hits += 1
+            return self._entries[match][1]
+
+    def put(self, key: int, value, camera_id: str = None):
+        """
+        Зберігає результат розпізнавання кадру.
+
+        Параметри:
+        key (int): Перцептивний хеш кадру.
+        value: Результат розпізнавання.
+        camera_id (str, optional): Ідентифікатор камери.
+        """
+        with self._lock:
+            self._entries[(camera_id, key)] = (time.monotonic(), value)
+            self._entries.move_to_end((camera_id, key))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        """
+        Лічильники кешу для вибору його розміру та часу життя записів.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'max_distance': self.max_distance,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,362 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .configures import (INFERENCE_WORKERS, INFERENCE_BACKEND, BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS,
+                         BATCH_RESPONSE_TIMEOUT, WARMUP_RUNS,
+                         CACHE_SIZE, CACHE_TTL_SECONDS, CACHE_MAX_DISTANCE, RECOGNITION_MODE, CAMERA_PROFILES,
+                         OUTPUT_FORMAT, OUTPUT_QUALITY, OUTPUT_MAX_SIZE, OUTPUT_CROP, WORKER_START_TIMEOUT)
+from .camera_profiles import load_profiles
+from .image_output import OutputOptions
+from .inference_server import InferenceServer
+from .metrics import MetricsRegistry
+from .recognition_cache import RecognitionCache, image_hash
+
+# Бар'єр запуску пулу, отриманий робочим процесом від ініціалізатора
+_start_barrier = None
+
+
+def _init_worker(backend, warmup_runs, start_barrier, *server_args):
+    """
+    Ініціалізатор робочого процесу пулу.
+
+    Завантажує класифікатор символів та каскад Хаара і виконує пробні проходи,
+    тож кожен процес тримає власну копію моделей і платить за завантаження один раз.
+    Якщо передано аргументи сервера класифікації, модель замінюється його клієнтом.
+
+    Параметри:
+    backend (str): Середовище виконання класифікатора ('keras', 'tflite' або 'onnx').
+    warmup_runs (int): Кількість пробних проходів моделей.
+    start_barrier (multiprocessing.Barrier): Бар'єр на max_workers учасників для _worker_status.
+    """
+    global _start_barrier
+    from .model_registry import registry
+
+    _start_barrier = start_barrier
+    if server_args:
+        from .inference_server import connect
+
+        registry.configure(backend=backend, classifier=connect(*server_args))
+    else:
+        registry.configure(backend=backend)
+    registry.warm_up(warmup_runs)
+
+
+def _worker_status(wait: bool = False):
+    """
+    Повертає ідентифікатор робочого процесу та стан його моделей.
+
+    Параметри:
+    wait (bool): Дочекатися на бар'єрі, доки такі ж задачі візьмуть усі робочі процеси.
+                 Процес, що чекає, не може взяти другу задачу, тож кожен процес звітує рівно
+                 один раз і лише після того, як усі процеси завантажили моделі.
+    """
+    from .model_registry import registry
+
+    if wait:
+        _start_barrier.wait(WORKER_START_TIMEOUT)
+    return os.getpid(), registry.status()
+
+
+def _recognize_plate(photo, mode, profile, output):
+    """
+    Виконує синхронний конвеєр розпізнавання у робочому процесі.
+
+    Параметри:
+    photo (str | bytes): Шлях до зображення автомобіля з номерним знаком або його вміст.
+    mode (str): Режим розпізнавання ('single' або 'tiered').
+    profile (CameraProfile): Профіль камери.
+    output (OutputOptions): Формат, якість і розмір зображення-результату.
+
+    Повертає:
+    tuple: Результат image_process.recognize_plate та тривалість його етапів.
+    """
+    from . import image_process
+
+    timings = {}
+    img_bytes, recognized_symbols, confidence = image_process.recognize_plate(photo, timings=timings, mode=mode,
+                                                                             profile=profile, output=output)
+    return img_bytes, recognized_symbols, confidence, timings
+
+
+def _recognize_plates(photo, profile, output):
+    """
+    Розпізнає всі номерні знаки зображення у робочому процесі.
+
+    Повертає:
+    tuple: Результат image_process.recognize_plates та тривалість його етапів.
+    """
+    from . import image_process
+
+    timings = {}
+    img_bytes, plates = image_process.recognize_plates(photo, timings=timings, profile=profile,
+                                                   output=output)
+    return img_bytes, plates, timings
+
+
+class RecognitionExecutor:
+    """
+    Виконавець розпізнавання номерних знаків у пулі робочих процесів.
+
+    Конвеєр (detectMultiScale, findContours, model.predict) повністю навантажує CPU,
+    тому він виконується поза циклом подій, а корутини лише очікують на результат.
+    Якщо batch_max_size більше 1, символи з усіх одночасних запитів класифікуються
+    спільними пакетами в окремому процесі InferenceServer; якщо цей процес завершився,
+    пул і сервер перезапускаються перед наступним запитом.
+    Тривалість етапів кожного запиту накопичується у гістограмах metrics.
+    Результати для повторних і майже однакових кадрів повертаються з cache.
+    Пул створюється під час виклику start або першого розпізнавання.
+    """
+
+    def __init__(self, max_workers: int = INFERENCE_WORKERS, backend: str = INFERENCE_BACKEND,
+                 batch_max_size: int = BATCH_MAX_SIZE, batch_max_wait_ms: float = BATCH_MAX_WAIT_MS,
+                 batch_response_timeout: float = BATCH_RESPONSE_TIMEOUT, warmup_runs: int = WARMUP_RUNS, cache_size: int = CACHE_SIZE,
+                 cache_ttl_seconds: float = CACHE_TTL_SECONDS, cache_max_distance: int = CACHE_MAX_DISTANCE,
+                 mode: str = RECOGNITION_MODE, camera_profiles: str = CAMERA_PROFILES,
+                 output_format: str = OUTPUT_FORMAT, output_quality: int = OUTPUT_QUALITY,
+                 output_max_size: int = OUTPUT_MAX_SIZE, output_crop: bool = OUTPUT_CROP):
+        self.max_workers = max_workers
+        self.backend = backend
+        self.batch_max_size = batch_max_size
+        self.batch_max_wait_ms = batch_max_wait_ms
+        self.batch_response_timeout = batch_response_timeout
+        self.warmup_runs = warmup_runs
+        self.mode = mode
+        self.profiles = load_profiles(camera_profiles)
+        self.output = OutputOptions(output_format, output_quality, output_max_size, output_crop)
+        self.state = 'idle'
+        self.metrics = MetricsRegistry()
+        self.cache = RecognitionCache(cache_size, cache_ttl_seconds, cache_max_distance)
+        self._pool = None
+        self._server = None
+        self._workers = {}
+        self._start_task = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn замість fork: TensorFlow не підтримує роботу після fork процесу
+            mp_context = multiprocessing.get_context('spawn')
+            initargs = (self.backend, self.warmup_runs, mp_context.Barrier(self.max_workers))
+            if self.batch_max_size > 1:
+                self._server = InferenceServer(self.max_workers, mp_context, self.backend,
+                                               self.batch_max_size, self.batch_max_wait_ms,
+                                               self.warmup_runs, self.batch_response_timeout)
+                self._server.start()
+                initargs += self._server.client_args()
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=mp_context,
+                initializer=_init_worker,
+                initargs=initargs,
+            )
+            self.state = 'starting'
+        return self._pool
+
+    def _server_failed(self) -> bool:
+        return self._server is not None and not self._server.is_alive()
+
+    def _restart_if_server_failed(self):
+        """
+        Зупиняє пул, якщо процес сервера класифікації завершився; наступний запит створить новий пул і сервер.
+        """
+        if self._server_failed():
+            logging.error(f'Inference server exited with code {self._server.exitcode}, restarting recognition workers')
+            self.shutdown(wait=False)
+
+    async def start(self):
+        """
+        Запускає всі робочі процеси та чекає, доки кожен завантажить і прогріє моделі.
+
+        Стан 'ready' встановлюється лише після звіту кожного з max_workers процесів.
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        try:
+            results = await asyncio.gather(
+                *[loop.run_in_executor(pool, _worker_status, True) for _ in range(self.max_workers)]
+            )
+        except Exception:
+            self.state = 'error'
+            raise
+        self._workers.update(results)
+        self.state = 'ready'
+
+    def start_in_background(self):
+        """
+        Запускає start як фонову задачу циклу подій, не затримуючи запуск застосунку.
+        """
+        def _log_failure(task):
+            if not task.cancelled() and task.exception() is not None:
+                logging.error(f'Recognition workers failed to start: {task.exception()}')
+
+        self._start_task = asyncio.get_running_loop().create_task(self.start())
+        self._start_task.add_done_callback(_log_failure)
+
+    def profile(self, camera_id: str = None):
+        """
+        Повертає профіль камери.
+
+        Параметри:
+        camera_id (str, optional): Ідентифікатор камери; None - профіль за замовчуванням.
+
+        Повертає:
+        CameraProfile: Профіль камери.
+
+        Raises:
+        ValueError: Якщо профілю для камери немає.
+        """
+        try:
+            return self.profiles[camera_id or 'default']
+        except KeyError:
+            raise ValueError(f'Невідома камера: {camera_id}') from None
+
+    async def recognize(self, photo, camera_id: str = None):
+        """
+        Розпізнавання номерного знаку в окремому процесі.
+
+        Параметри:
+        photo (str | bytes): Шлях до зображення автомобіля з номерним знаком або його вміст.
+        camera_id (str, optional): Ідентифікатор камери, профіль якої використовується.
+
+        Повертає:
+        tuple: Зображення з рамкою навколо номерного знаку (bytes), розпізнані символи та
+        відкалібрована впевненість (або None, якщо номерний знак не виявлено).
+        Для того самого кадру (або, якщо cache.max_distance > 0, майже однакового),
+        розпізнаного протягом cache.ttl_seconds, повертається попередній результат.
+        """
+        profile = self.profile(camera_id)
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        self._restart_if_server_failed()
+        key = None
+        if self.cache.enabled:
+            key = await asyncio.to_thread(image_hash, photo, self.cache.perceptual)
+            cached = self.cache.get(key, profile.camera_id) if key is not None else None
+            if cached is not None:
+                self.metrics.observe('request', 'cached', time.perf_counter() - start)
+                return cached
+        try:
+            img_bytes, recognized_symbols, confidence, timings = await loop.run_in_executor(
+                self._get_pool(), _recognize_plate, photo, self.mode, profile, self.output
+            )
+        except BrokenProcessPool:
+            # Робочий процес аварійно завершився - наступний виклик створить новий пул
+            self.shutdown(wait=False)
+            self.state = 'error'
+            self.metrics.observe('request', 'error', time.perf_counter() - start)
+            raise
+        except ValueError:
+            self.metrics.observe('request', 'error', time.perf_counter() - start)
+            raise
+        except RuntimeError:
+            # Сервер класифікації не відповів - якщо його процес завершився, пул буде перезапущено
+            self.metrics.observe('request', 'error', time.perf_counter() - start)
+            self._restart_if_server_failed()
+            raise
+        # request - повний час з точки зору циклу подій, разом з чергою та передачею даних
+        timings['request'] = time.perf_counter() - start
+        self.metrics.observe_timings(timings, 'recognized' if recognized_symbols else 'unrecognized')
+        # Нерозпізнаний кадр не кешується: повторна спроба має розпізнавати його знову
+        if key is not None and recognized_symbols:
+            self.cache.put(key, (img_bytes, recognized_symbols, confidence), profile.camera_id)
+        if self.state == 'starting' and self._start_task is None:
+            self.state = 'ready'
+        return img_bytes, recognized_symbols, confidence
+
+    async def recognize_all(self, photo, camera_id: str = None):
+        """
+        Розпізнавання всіх номерних знаків кадру в окремому процесі.
+
+        Результат не кешується: кеш зберігає результати recognize з одним номером.
+
+        Параметри:
+        photo (str | bytes): Шлях до зображення або його вміст.
+        camera_id (str, optional): Ідентифікатор камери, профіль якої використовується.
+
+        Повертає:
+        tuple: Зображення з рамками навколо номерних знаків (bytes) та список прочитань
+        {'box', 'plate', 'confidence', 'grammar'} від найкращого.
+        """
+        profile = self.profile(camera_id)
+        start = time.perf_counter()
+        self._restart_if_server_failed()
+        try:
+            img_bytes, plates, timings = await asyncio.get_running_loop().run_in_executor(
+                self._get_pool(), _recognize_plates, photo, profile, self.output
+            )
+        except BrokenProcessPool:
+            self.shutdown(wait=False)
+            self.state = 'error'
+            self.metrics.observe('request', 'error', time.perf_counter() - start)
+            raise
+        except ValueError:
+            self.metrics.observe('request', 'error', time.perf_counter() - start)
+            raise
+        except RuntimeError:
+            # Сервер класифікації не відповів - якщо його процес завершився, пул буде перезапущено
+            self.metrics.observe('request', 'error', time.perf_counter() - start)
+            self._restart_if_server_failed()
+            raise
+        timings['request'] = time.perf_counter() - start
+        self.metrics.observe_timings(timings, 'recognized' if plates else 'unrecognized')
+        return img_bytes, plates
+
+    async def plate_recognize(self, photo, camera_id: str = None):
+        """
+        Розпізнавання номерного знаку в окремому процесі.
+
+        Параметри:
+        photo (str | bytes): Шлях до зображення автомобіля з номерним знаком або його вміст.
+        camera_id (str, optional): Ідентифікатор камери, профіль якої використовується.
+
+        Повертає:
+        tuple: Зображення з рамкою навколо номерного знаку (bytes) та розпізнані символи або None.
+        """
+        img_bytes, recognized_symbols, _ = await self.recognize(photo, camera_id)
+        return img_bytes, recognized_symbols
+
+    def status(self) -> dict:
+        """
+        Повертає стан пулу розпізнавання для перевірки працездатності.
+
+        Повертає:
+        dict: Стан пулу, налаштування та стан моделей у кожному робочому процесі.
+        Якщо процес сервера класифікації завершився, стан - 'error'.
+        """
+        return {
+            'state': 'error' if self._server_failed() else self.state,
+            'backend': self.backend,
+            'mode': self.mode,
+            'cameras': sorted(self.profiles),
+            'output': {'format': self.output.format, 'quality': self.output.quality,
+                       'max_size': self.output.max_size, 'crop': self.output.crop},
+            'max_workers': self.max_workers,
+            'micro_batching': self.batch_max_size > 1,
+            'inference_server': None if self._server is None else {
+                'alive': self._server.is_alive(), 'exitcode': self._server.exitcode},
+            'workers': [{'pid': pid, **status} for pid, status in self._workers.items()],
+        }
+
+    def shutdown(self, wait: bool = True):
+        """
+        Зупиняє пул робочих процесів та сервер класифікації.
+
+        Параметри:
+        wait (bool): Чекати на завершення задач, що виконуються.
+        """
+        if self._start_task is not None:
+            self._start_task.cancel()
+            self._start_task = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+        if self._server is not None:
+            self._server.stop()
+            self._server = None
+        self._workers.clear()
+        self.state = 'idle'
+
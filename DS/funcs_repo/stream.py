@@ -0,0 +1,326 @@
+"""
+Потоковий режим розпізнавання: відеофайл або послідовність кадрів замість камери біля шлагбаума.
+
+Кадри без руху пропускаються без виявлення номерних знаків, виявлені номерні
+знаки супроводжуються між кадрами за перетином прямокутників (IoU), а символи
+розпізнаються лише для нового номерного знаку або поки впевненість у ньому
+низька; прочитання одного треку об'єднуються голосуванням за позиціями символів.
+Для кожного автомобіля формується одна подія в'їзду.
+
+Запуск з кореня репозиторію:
+    python -m DS.funcs_repo.stream gate.mp4 --output events.jsonl
+    python -m DS.funcs_repo.stream DS/frames/ --fps 10
+"""
+import argparse
+import json
+import os
+import sys
+
+import cv2
+import numpy as np
+
+from . import image_process
+from .image_process import iou, overlap_of_smaller, suppress_nested
+from .camera_profiles import DEFAULT_PROFILE, CameraProfile, load_profiles
+from .configures import *
+from .datasets import IMAGE_EXTENSIONS
+from .voting import fuse_probabilities, plate_character_probabilities
+
+
+def iter_frames(source: str, fps: float = None, step: int = 1):
+    """
+    Читає кадри з відеофайлу або каталогу зображень.
+
+    Параметри:
+    source (str): Відеофайл або каталог з кадрами (у порядку назв файлів).
+    fps (float, optional): Частота кадрів; для відео за замовчуванням береться з файлу.
+    step (int): Обробляти кожен step-й кадр.
+
+    Повертає:
+    generator: Трійки (номер кадру, час кадру у секундах, кадр).
+    """
+    if os.path.isdir(source):
+        fps = fps or STREAM_FPS
+        files = sorted(name for name in os.listdir(source) if name.lower().endswith(IMAGE_EXTENSIONS))
+        for index in range(0, len(files), step):
+            frame = cv2.imread(os.path.join(source, files[index]))
+            if frame is not None:
+                yield index, index / fps, frame
+        return
+
+    capture = cv2.VideoCapture(source)
+    if not capture.isOpened():
+        raise ValueError(f'Не вдалося відкрити відео {source}')
+    fps = fps or capture.get(cv2.CAP_PROP_FPS) or STREAM_FPS
+    index = 0
+    try:
+        while True:
+            # grab без декодування для пропущених кадрів
+            if index % step:
+                if not capture.grab():
+                    break
+            else:
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                yield index, index / fps, frame
+            index += 1
+    finally:
+        capture.release()
+
+
+class MotionGate:
+    """
+    Визначає, чи змінився кадр порівняно з попереднім.
+
+    Кадри порівнюються у зменшеному та розмитому вигляді у відтінках сірого, тож
+    перевірка коштує частки мілісекунди і не реагує на шум сенсора. Якщо задано roi,
+    враховується лише рух у цій області (наприклад, на смузі перед шлагбаумом).
+    """
+
+    def __init__(self, threshold: int = MOTION_THRESHOLD, min_area: float = MOTION_MIN_AREA,
+                 width: int = 160, roi=None):
+        self.threshold = threshold
+        self.min_area = min_area
+        self.width = width
+        self.roi = roi
+        self._previous = None
+
+    def moving(self, frame) -> bool:
+        """
+        Параметри:
+        frame (numpy.array): Кадр у форматі BGR.
+
+        Повертає:
+        bool: True, якщо частка змінених пікселів перевищує min_area (або це перший кадр).
+        """
+        if self.roi is not None:
+            x, y, w, h = self.roi
+            frame = frame[max(0, y):y + h, max(0, x):x + w]
+        height = max(1, frame.shape[0] * self.width // frame.shape[1])
+        small = cv2.resize(frame, (self.width, height), interpolation=cv2.INTER_AREA)
+        gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+        previous, self._previous = self._previous, gray
+        if previous is None:
+            return True
+        changed = np.count_nonzero(cv2.absdiff(gray, previous) > self.threshold)
+        return changed > self.min_area * gray.size
+
+
+class Track:
+    """
+    Номерний знак, що супроводжується між кадрами.
+
+    Ймовірності символів усіх прочитань зберігаються, і номер треку - це їхній
+    консенсус (fuse_probabilities), а не найкраще окреме прочитання.
+    """
+
+    def __init__(self, track_id: int, box, frame_index: int):
+        self.id = track_id
+        self.box = box
+        self.first_frame = frame_index
+        self.last_frame = frame_index
+        self.missed = 0
+        self.readings = []
+        self.plate = None
+        self.confidence = 0.0
+        self.emitted = False
+
+    def confirmed(self, min_confidence: float, min_reads: int) -> bool:
+        return self.confidence >= min_confidence and len(self.readings) >= min_reads
+
+    def needs_read(self, min_confidence: float, min_reads: int, max_reads: int) -> bool:
+        return not self.confirmed(min_confidence, min_reads) and len(self.readings) < max_reads
+
+    def update_read(self, probabilities):
+        """
+        Додає ймовірності символів нового прочитання та оновлює консенсусний номер.
+
+        Параметри:
+        probabilities (numpy.ndarray): Ймовірності символів з розмірами (N, len(CHARACTERS)).
+        """
+        self.readings.append(probabilities)
+        plate, fused = fuse_probabilities(self.readings)
+        self.plate = plate or None
+        self.confidence = image_process.plate_confidence(fused)
+
+
+class PlateStream:
+    """
+    Обробник потоку кадрів з однієї камери.
+
+    Параметри:
+    min_confidence (float): Впевненість, після якої номер вважається розпізнаним і символи більше не читаються.
+    min_reads (int): Мінімальна кількість прочитань, що об'єднуються перед підтвердженням номера.
+    max_reads (int): Максимальна кількість спроб розпізнавання для одного номерного знаку.
+    iou_threshold (float): Мінімальний IoU для зіставлення виявлення з наявним треком.
+    max_missed (int): Кількість кадрів з рухом без зіставлення, після яких трек завершується.
+    profile (CameraProfile, optional): Профіль камери: область пошуку, розміри номерного знаку та параметри.
+    """
+
+    def __init__(self, min_confidence: float = STREAM_MIN_CONFIDENCE, min_reads: int = STREAM_MIN_READS,
+                 max_reads: int = STREAM_MAX_READS,
+                 iou_threshold: float = TRACK_IOU, max_missed: int = TRACK_MAX_MISSED,
+                 motion_gate: MotionGate = None, profile: CameraProfile = DEFAULT_PROFILE):
+        self.min_confidence = min_confidence
+        self.min_reads = min_reads
+        self.max_reads = max_reads
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.profile = profile
+        self.motion_gate = motion_gate or MotionGate(roi=profile.roi)
+        self.tracks = []
+        self.stats = {'frames': 0, 'motion_frames': 0, 'detections': 0, 'reads': 0, 'events': 0}
+        self._next_id = 1
+
+    def _event(self, track: Track, frame_index: int, timestamp: float) -> dict:
+        track.emitted = True
+        self.stats['events'] += 1
+        return {
+            'event': 'entry',
+            'track': track.id,
+            'plate': track.plate,
+            'confidence': round(track.confidence, 4),
+            'confirmed': track.confirmed(self.min_confidence, self.min_reads),
+            'frame': frame_index,
+            'time': round(timestamp, 3),
+        }
+
+    def _match(self, boxes, frame_index: int) -> list:
+        """
+        Жадібно зіставляє виявлення з треками за спаданням IoU і створює треки для нових номерів.
+        """
+        # Каскад інколи знаходить лише частину номерного знаку, тому враховується і вкладеність
+        pairs = sorted(((max(iou(track.box, box), overlap_of_smaller(track.box, box)), t, b)
+                        for t, track in enumerate(self.tracks)
+                        for b, box in enumerate(boxes)), reverse=True)
+        matched_tracks, matched_boxes, result = set(), set(), []
+        for overlap, t, b in pairs:
+            if overlap < self.iou_threshold:
+                break
+            if t in matched_tracks or b in matched_boxes:
+                continue
+            matched_tracks.add(t)
+            matched_boxes.add(b)
+            track = self.tracks[t]
+            track.box, track.last_frame, track.missed = boxes[b], frame_index, 0
+            result.append(track)
+        for t, track in enumerate(self.tracks):
+            if t not in matched_tracks:
+                track.missed += 1
+        for b, box in enumerate(boxes):
+            if b not in matched_boxes:
+                track = Track(self._next_id, box, frame_index)
+                self._next_id += 1
+                self.tracks.append(track)
+                result.append(track)
+        return result
+
+    def process(self, frame, frame_index: int, timestamp: float) -> list:
+        """
+        Обробляє один кадр.
+
+        Параметри:
+        frame (numpy.array): Кадр у форматі BGR.
+        frame_index (int): Номер кадру.
+        timestamp (float): Час кадру у секундах.
+
+        Повертає:
+        list: Події в'їзду, сформовані на цьому кадрі.
+        """
+        self.stats['frames'] += 1
+        # Без руху сцена не змінилась: треки та їхні результати залишаються чинними
+        if not self.motion_gate.moving(frame):
+            return []
+        self.stats['motion_frames'] += 1
+
+        boxes = suppress_nested(image_process.find_plates(frame, **self.profile.detection_args()))
+        self.stats['detections'] += len(boxes)
+        events = []
+        tracks = self._match(boxes, frame_index)
+        # Символи всіх треків, яким потрібне прочитання, класифікуються одним пакетом
+        reading = [track for track in tracks if track.needs_read(self.min_confidence, self.min_reads, self.max_reads)]
+        if reading:
+            crops = [frame[y:y + h, x:x + w] for x, y, w, h in (track.box for track in reading)]
+            for track, probabilities in zip(reading, plate_character_probabilities(
+                    crops, **self.profile.segmentation_args())):
+                self.stats['reads'] += 1
+                track.update_read(probabilities)
+        for track in tracks:
+            if not track.emitted and track.confirmed(self.min_confidence, self.min_reads):
+                events.append(self._event(track, frame_index, timestamp))
+
+        # Номер зник з кадру: подія з найкращим результатом, навіть якщо він не підтверджений
+        for track in [track for track in self.tracks if track.missed > self.max_missed]:
+            self.tracks.remove(track)
+            if not track.emitted and track.plate:
+                events.append(self._event(track, frame_index, timestamp))
+        return events
+
+    def finish(self, frame_index: int, timestamp: float) -> list:
+        """
+        Завершує всі треки наприкінці потоку.
+
+        Повертає:
+        list: Події для треків, які ще не сформували подію.
+        """
+        events = [self._event(track, frame_index, timestamp) for track in self.tracks
+                  if not track.emitted and track.plate]
+        self.tracks = []
+        return events
+
+
+def run_stream(source: str, fps: float = None, step: int = 1, stream: PlateStream = None):
+    """
+    Обробляє весь відеофайл або послідовність кадрів.
+
+    Параметри:
+    source (str): Відеофайл або каталог з кадрами.
+    fps (float, optional): Частота кадрів.
+    step (int): Обробляти кожен step-й кадр.
+    stream (PlateStream, optional): Обробник потоку з власними налаштуваннями.
+
+    Повертає:
+    generator: Події в'їзду в міру їх появи.
+    """
+    stream = stream or PlateStream()
+    frame_index, timestamp = 0, 0.0
+    for frame_index, timestamp, frame in iter_frames(source, fps=fps, step=step):
+        yield from stream.process(frame, frame_index, timestamp)
+    yield from stream.finish(frame_index, timestamp)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Розпізнавання номерних знаків у відео або послідовності кадрів.')
+    parser.add_argument('source', help='Відеофайл або каталог з кадрами')
+    parser.add_argument('--fps', type=float, help='Частота кадрів (для каталогу кадрів)')
+    parser.add_argument('--step', type=int, default=1, help='Обробляти кожен step-й кадр')
+    parser.add_argument('--min-confidence', type=float, default=STREAM_MIN_CONFIDENCE)
+    parser.add_argument('--min-reads', type=int, default=STREAM_MIN_READS)
+    parser.add_argument('--backend', default=INFERENCE_BACKEND, help='keras, tflite або onnx')
+    parser.add_argument('--camera', default='default', help='Ідентифікатор камери у файлі профілів')
+    parser.add_argument('--profiles', default=CAMERA_PROFILES, help='Файл профілів камер')
+    parser.add_argument('--output', help='Файл JSONL для подій (за замовчуванням - stdout)')
+    args = parser.parse_args(argv)
+
+    from .model_registry import registry
+
+    registry.configure(backend=args.backend)
+    profiles = load_profiles(args.profiles)
+    if args.camera not in profiles:
+        parser.error(f'Невідома камера: {args.camera}')
+    stream = PlateStream(min_confidence=args.min_confidence, min_reads=args.min_reads,
+                         profile=profiles[args.camera])
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for event in run_stream(args.source, fps=args.fps, step=args.step, stream=stream):
+            output.write(json.dumps(event, ensure_ascii=False) + '\n')
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(json.dumps(stream.stats), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+"""
+Підбір параметрів виявлення і сегментації номерних знаків.
+
+Перебирає сітку значень scaleFactor і minNeighbors каскаду та коефіцієнтів розмірів
+контурів символів (TUNING_GRID у configures.py) або випадкову вибірку з неї на
+розмічених фотографіях. Кожен набір параметрів оцінюється в окремому процесі на всіх
+фотографіях: точність номерів і символів та затримка розпізнавання без декодування
+зображення (воно від параметрів не залежить). Кодування результату в режимі single
+виконується у фоновому потоці одночасно з розпізнаванням символів, тож у затримку
+входить лише та його частина, на яку конвеєр чекає після класифікації.
+
+Результат - фронт Парето "точність / затримка": набори, для яких немає іншого,
+водночас точнішого і швидшого. Вибраний з фронту набір записується у файл профілів
+камер, який завантажується під час роботи сервісу.
+
+Запуск з кореня репозиторію:
+    python -m DS.funcs_repo.tuning DS/img --workers 4 --output tuning.json
+    python -m DS.funcs_repo.tuning DS/img --samples 40 --max-latency-ms 50 --save --camera gate-1
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+
+from .benchmark import latency_summary
+from .camera_profiles import DEFAULT_PROFILE, CameraProfile, load_profiles, save_profile
+from .configures import INFERENCE_BACKEND, RECOGNITION_MODE, CAMERA_PROFILES, TUNING_GRID
+from .datasets import iter_plate_images, plate_label
+from .parallel import imap_unordered
+from .plate_grammar import edit_distance
+
+# Розмічені фотографії, завантажені у робочому процесі один раз
+_images = []
+
+
+def _init_worker(backend: str, path: str):
+    from .model_registry import registry
+
+    registry.configure(backend=backend)
+    registry.warm_up()
+    _images.extend(iter_plate_images(path))
+
+
+def parameter_grid(grid: dict = TUNING_GRID, samples: int = None, seed: int = 0) -> list:
+    """
+    Набори параметрів для перебору.
+
+    Параметри:
+    grid (dict): Значення для кожного поля профілю камери.
+    samples (int, optional): Кількість випадкових наборів із сітки (None - уся сітка).
+    seed (int): Початкове значення генератора випадкових чисел.
+
+    Повертає:
+    list: Словники {поле профілю: значення}.
+    """
+    names = list(grid)
+    combinations = [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+    if samples is not None and samples < len(combinations):
+        combinations = random.Random(seed).sample(combinations, samples)
+    return combinations
+
+
+def evaluate(params: dict, mode: str = RECOGNITION_MODE, base: CameraProfile = DEFAULT_PROFILE) -> dict:
+    """
+    Оцінює один набір параметрів на фотографіях, завантажених у робочому процесі.
+
+    Параметри:
+    params (dict): Поля профілю камери, що перевіряються.
+    mode (str): Режим розпізнавання ('single' або 'tiered').
+    base (CameraProfile): Профіль, значення якого використовуються для інших полів.
+
+    Повертає:
+    dict: Параметри, точність номерів і символів та статистика затримки у мілісекундах.
+    """
+    from .image_process import recognize_plate
+
+    profile = CameraProfile.from_dict(base.camera_id, params, base=base)
+    latencies, correct, chars_total, chars_wrong = [], 0, 0, 0
+    for name, data in _images:
+        label = plate_label(name)
+        timings = {}
+        try:
+            _, plate, _ = recognize_plate(data, timings=timings, mode=mode, profile=profile)
+        except ValueError:
+            continue
+        # Критичний шлях: encode не віднімається, бо він частково перекривається з segment/classify,
+        # а total уже містить лише неперекриту частину очікування на нього
+        latencies.append(timings['total'] - timings.get('decode', 0))
+        correct += plate == label
+        chars_total += len(label)
+        chars_wrong += min(edit_distance(plate or '', label), len(label))
+
+    return {
+        'params': params,
+        'count': len(latencies),
+        'plate_accuracy': round(correct / len(latencies), 4) if latencies else 0.0,
+        'char_accuracy': round(1 - chars_wrong / chars_total, 4) if chars_total else 0.0,
+        'latency_ms': latency_summary(latencies),
+    }
+
+
+def _accuracy(result: dict) -> tuple:
+    return result['plate_accuracy'], result['char_accuracy']
+
+
+def pareto_front(results: list) -> list:
+    """
+    Набори параметрів, для яких немає іншого, водночас точнішого і швидшого.
+
+    Точність порівнюється за точністю номерів, а за рівної - за точністю символів;
+    затримка - за середнім значенням.
+
+    Параметри:
+    results (list): Результати evaluate.
+
+    Повертає:
+    list: Результати фронту за зростанням затримки (і точності).
+    """
+    front = []
+    for result in sorted(results, key=lambda r: (r['latency_ms'].get('mean', float('inf')),
+                                                 tuple(-v for v in _accuracy(r)))):
+        if not front or _accuracy(result) > _accuracy(front[-1]):
+            front.append(result)
+    return front
+
+
+def choose(front: list, max_latency_ms: float = None, min_accuracy: float = None) -> dict:
+    """
+    Вибирає набір параметрів з фронту Парето.
+
+    Параметри:
+    front (list): Фронт Парето за зростанням затримки.
+    max_latency_ms (float, optional): Найточніший набір із середньою затримкою не більше заданої.
+    min_accuracy (float, optional): Найшвидший набір з точністю номерів не менше заданої.
+    Без обмежень вибирається найточніший набір.
+
+    Повертає:
+    dict: Вибраний результат або None, якщо обмеженням не відповідає жоден набір.
+    """
+    candidates = front
+    if max_latency_ms is not None:
+        candidates = [result for result in candidates if result['latency_ms'].get('mean', float('inf')) <= max_latency_ms]
+    if min_accuracy is not None:
+        candidates = [result for result in candidates if result['plate_accuracy'] >= min_accuracy]
+        return candidates[0] if candidates else None
+    return candidates[-1] if candidates else None
+
+
+def tune(source: str, workers: int, backend: str = INFERENCE_BACKEND, mode: str = RECOGNITION_MODE,
+         base: CameraProfile = DEFAULT_PROFILE, grid: dict = TUNING_GRID, samples: int = None,
+         seed: int = 0) -> dict:
+    """
+    Перебирає набори параметрів на розмічених фотографіях.
+
+    Параметри:
+    source (str): Каталог або zip-архів фотографій, назва файлу - правильний номер.
+    workers (int): Кількість робочих процесів; 0 - виконання у поточному процесі.
+    backend (str): Середовище виконання класифікатора.
+    mode (str): Режим розпізнавання ('single' або 'tiered').
+    base (CameraProfile): Профіль камери, параметри якого підбираються.
+    grid (dict): Значення для кожного поля профілю.
+    samples (int, optional): Кількість випадкових наборів із сітки (None - уся сітка).
+    seed (int): Початкове значення генератора випадкових чисел.
+
+    Повертає:
+    dict: Результати всіх наборів і фронт Парето.
+    """
+    combinations = parameter_grid(grid, samples, seed)
+    task = partial(evaluate, mode=mode, base=base)
+    start = time.perf_counter()
+    if workers > 0:
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_init_worker, initargs=(backend, source))
+        try:
+            results = list(imap_unordered(pool, task, combinations, max_pending=workers * 2))
+        finally:
+            pool.shutdown(cancel_futures=True)
+    else:
+        _init_worker(backend, source)
+        results = [task(params) for params in combinations]
+
+    return {
+        'source': source,
+        'mode': mode,
+        'camera': base.camera_id,
+        'backend': backend,
+        'workers': workers,
+        'evaluated': len(results),
+        'seconds': round(time.perf_counter() - start, 3),
+        'results': results,
+        'pareto_front': pareto_front(results),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Підбір параметрів виявлення і сегментації номерних знаків.')
+    parser.add_argument('source', help='Каталог або zip-архів фотографій, назва файлу - правильний номер')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='Кількість робочих процесів (0 - у поточному процесі)')
+    parser.add_argument('--backend', default=INFERENCE_BACKEND, help='keras, tflite або onnx')
+    parser.add_argument('--mode', default=RECOGNITION_MODE, help='single або tiered')
+    parser.add_argument('--samples', type=int, help='Кількість випадкових наборів замість усієї сітки')
+    parser.add_argument('--seed', type=int, default=0, help='Початкове значення для випадкової вибірки')
+    parser.add_argument('--grid', help='JSON-файл із сіткою значень замість TUNING_GRID')
+    parser.add_argument('--camera', default='default', help='Ідентифікатор камери у файлі профілів')
+    parser.add_argument('--profiles', default=CAMERA_PROFILES, help='Файл профілів камер')
+    parser.add_argument('--max-latency-ms', type=float, help='Найточніший набір із затримкою не більше заданої')
+    parser.add_argument('--min-accuracy', type=float, help='Найшвидший набір з точністю номерів не менше заданої')
+    parser.add_argument('--save', action='store_true', help='Записати вибраний набір у файл профілів')
+    parser.add_argument('--output', help='Шлях для збереження JSON-звіту')
+    args = parser.parse_args(argv)
+
+    grid = TUNING_GRID
+    if args.grid:
+        with open(args.grid, encoding='utf-8') as file:
+            grid = json.load(file)
+    profiles = load_profiles(args.profiles)
+    base = profiles.get(args.camera) or CameraProfile.from_dict(args.camera, {}, base=profiles['default'])
+
+    report = {'created_at': datetime.now().isoformat(timespec='seconds')}
+    report.update(tune(args.source, args.workers, backend=args.backend, mode=args.mode, base=base,
+                       grid=grid, samples=args.samples, seed=args.seed))
+    chosen = choose(report['pareto_front'], args.max_latency_ms, args.min_accuracy)
+    report['chosen'] = chosen
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+
+    print(json.dumps({key: report[key] for key in ('evaluated', 'seconds', 'pareto_front', 'chosen')},
+                     indent=2, ensure_ascii=False))
+    if args.save:
+        if chosen is None:
+            raise SystemExit('Жоден набір параметрів не відповідає обмеженням')
+        save_profile(args.camera, chosen['params'], args.profiles)
+        print(f"Профіль камери '{args.camera}' записано у {args.profiles}")
+
+
+if __name__ == '__main__':
+    main()
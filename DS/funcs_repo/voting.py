@@ -0,0 +1,94 @@
+"""
+Об'єднання результатів розпізнавання кількох кадрів одного автомобіля.
+
+Один кадр дає шумний результат: помилка в одному символі змінює весь номер.
+Символи з усіх кадрів класифікуються одним пакетом, а ймовірності об'єднуються
+для кожної позиції символу окремо.
+"""
+import numpy as np
+
+from . import image_process
+from .configures import CHARACTERS, SEGMENTER
+
+
+def fuse_probabilities(reads):
+    """
+    Об'єднує ймовірності символів кількох прочитань одного номерного знаку.
+
+    Прочитання з різною кількістю символів не можна зіставити за позиціями, тому
+    спочатку вибирається довжина номера з найбільшою сумарною впевненістю прочитань,
+    а далі для кожної позиції усереднюються ймовірності прочитань цієї довжини.
+    Усереднення (а не добуток) ймовірностей стійке до окремих надто впевнених помилок.
+
+    Параметри:
+    reads (list): Масиви ймовірностей з розмірами (N_i, len(CHARACTERS)) для кожного прочитання.
+
+    Повертає:
+    str: Об'єднаний номер (порожній рядок, якщо символів не знайдено).
+    numpy.ndarray: Об'єднана ймовірність вибраного символу на кожній позиції.
+    """
+    scores = {}
+    for proba in reads:
+        if len(proba):
+            length = len(proba)
+            scores[length] = scores.get(length, 0.0) + image_process.plate_confidence(proba.max(axis=1))
+    if not scores:
+        return '', np.zeros(0, dtype=np.float32)
+
+    length = max(scores, key=scores.get)
+    fused = np.mean([proba for proba in reads if len(proba) == length], axis=0)
+    y_ = np.argmax(fused, axis=1)
+    plate = ''.join(CHARACTERS[i] for i in y_)
+    return plate, fused[np.arange(length), y_]
+
+
+def plate_character_probabilities(plates, threshold: int = None, bounds=None, segmenter: str = SEGMENTER):
+    """
+    Класифікує символи кількох зображень номерного знаку за один прохід моделі.
+
+    Параметри:
+    plates (list): Зображення області номерного знаку.
+    threshold (int, optional): Поріг бінаризації для segment_characters (None - метод Оцу).
+    bounds (tuple, optional): Коефіцієнти розмірів контурів символів.
+    segmenter (str): Спосіб пошуку символів ('contours' або 'components').
+
+    Повертає:
+    list: Масиви ймовірностей символів для кожного зображення.
+    """
+    return image_process.character_probabilities_batch(
+        [image_process.segment_characters(plate, threshold=threshold, bounds=bounds, segmenter=segmenter)
+         for plate in plates])
+
+
+def vote_plates(plates):
+    """
+    Консенсусний номер за кількома зображеннями номерного знаку одного автомобіля.
+
+    Параметри:
+    plates (list): Зображення області номерного знаку (наприклад, з різних кадрів).
+
+    Повертає:
+    str: Консенсусний номер.
+    float: Впевненість у ньому - добуток об'єднаних ймовірностей символів.
+    """
+    if not plates:
+        return '', 0.0
+    plate, probabilities = fuse_probabilities(plate_character_probabilities(plates))
+    return plate, image_process.plate_confidence(probabilities)
+
+
+def vote_frames(frames):
+    """
+    Консенсусний номер за кількома кадрами одного автомобіля.
+
+    Параметри:
+    frames (list): Кадри у форматі BGR.
+
+    Повертає:
+    str: Консенсусний номер або None, якщо номерний знак не виявлено на жодному кадрі.
+    float: Впевненість у ньому.
+    """
+    plates = [plate for plate in (image_process.detect_plate(frame)[1] for frame in frames) if plate is not None]
+    if not plates:
+        return None, 0.0
+    return vote_plates(plates)
@@ -0,0 +1,38 @@
+"""history open session index
+
+Revision ID: 3b1f6c2d9a47
+Revises: e1a4f0c7b2d3
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b1f6c2d9a47'
+down_revision: Union[str, None] = 'e1a4f0c7b2d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_history_open_car_id',
+        'history',
+        ['car_id'],
+        unique=False,
+        postgresql_where=sa.text('exit_time IS NULL'),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_history_open_car_id',
+        table_name='history',
+        postgresql_where=sa.text('exit_time IS NULL'),
+        if_exists=True,
+    )
@@ -0,0 +1,37 @@
+"""occupancy counter
+
+Revision ID: 8c4e2a7f1d90
+Revises: 3b1f6c2d9a47
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4e2a7f1d90'
+down_revision: Union[str, None] = '3b1f6c2d9a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'occupancy',
+        sa.Column('occupied', sa.Integer(), nullable=False),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.execute(
+        "INSERT INTO occupancy (id, occupied, created_at, updated_at) "
+        "SELECT 1, count(*), now(), now() FROM history WHERE exit_time IS NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('occupancy')
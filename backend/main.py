@@ -3,7 +3,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.src.database.db import get_db
+from backend.src.conf.config import config
+from backend.src.database.db import get_db, sessionmanager
+from backend.src.services.occupancy import occupancy_service
+from backend.src.services.recognition import recognition_service
 from backend.src.routes import (
     auth_routes,
     admin_routes,
@@ -35,6 +38,21 @@ app.include_router(tg_routes.router, prefix="/api")
 app.include_router(picture_routes.router, prefix="/api")
 
 
+@app.on_event("startup")
+async def startup():
+    # Моделі розпізнавання завантажуються у фоні, API приймає запити одразу
+    if config.ALPR_PRELOAD:
+        recognition_service.start_in_background()
+    # Лічильник зайнятих місць звіряється з історією: відкриті записи могли видалити разом з авто
+    async with sessionmanager.session() as session:
+        await occupancy_service.resync(session)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    recognition_service.shutdown()
+
+
 @app.get("/api/healthchecker")
 async def healthchecker(db: AsyncSession = Depends(get_db)):
 
@@ -43,7 +61,7 @@ async def healthchecker(db: AsyncSession = Depends(get_db)):
         result = result.fetchone()
         if result is None:
             raise HTTPException(status_code=500, detail="Database is not configured correctly")
-        return {"message": "Welcome to FastAPI!"}
+        return {"message": "Welcome to FastAPI!", "alpr": recognition_service.status()}
     except Exception as e:
         print(e)
         raise HTTPException(status_code=500, detail="Error connecting to the database")
@@ -12,6 +12,25 @@ class Settings(BaseSettings):
     CLD_NAME: str = "cloud_name"
     CLD_API_KEY: int = 12345678
     CLD_API_SECRET: str = "api_secret"
+    ALPR_WORKERS: int = 2
+    ALPR_BACKEND: str = "keras"
+    ALPR_RECOGNITION_MODE: str = "single"
+    ALPR_CAMERA_PROFILES: str = "DS/camera_profiles.json"
+    ALPR_PRELOAD: bool = True
+    ALPR_WARMUP_RUNS: int = 1
+    ALPR_BATCH_MAX_SIZE: int = 64
+    ALPR_BATCH_MAX_WAIT_MS: float = 5
+    ALPR_BATCH_RESPONSE_TIMEOUT: float = 60
+    ALPR_CACHE_SIZE: int = 0
+    ALPR_CACHE_TTL_SECONDS: float = 10
+    ALPR_CACHE_MAX_DISTANCE: int = 0
+    ALPR_OUTPUT_FORMAT: str = "png"
+    ALPR_OUTPUT_QUALITY: int = 85
+    ALPR_OUTPUT_MAX_SIZE: int | None = None
+    ALPR_OUTPUT_CROP: bool = False
+    ALPR_CORRECTION_MAX_DISTANCE: int = 1
+    ALPR_CORRECTION_CONFIDENCE: float = 0.9
+    RATE_CACHE_TTL_SECONDS: float = 300
 
     model_config = ConfigDict(
         extra="ignore", env_file=".env", env_file_encoding="utf-8"  # noqa
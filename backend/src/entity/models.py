@@ -12,6 +12,8 @@ from sqlalchemy import (
     Float,
     Table,
     Column,
+    Index,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, DeclarativeBase, relationship
 
@@ -134,6 +136,14 @@ class History(TimeStampMixin, Base):
     """SQLAlchemy model representing the 'history' table in the database."""
 
     __tablename__ = "history"
+    __table_args__ = (
+        # Open parking sessions only: create_exit looks up the car's session without scanning the table
+        Index(
+            "ix_history_open_car_id",
+            "car_id",
+            postgresql_where=text("exit_time IS NULL"),
+        ),
+    )
     entry_time: Mapped[DateTime] = mapped_column(DateTime, nullable=True)
     exit_time: Mapped[DateTime] = mapped_column(DateTime, nullable=True)
     parking_time: Mapped[float] = mapped_column(Float, nullable=True)
@@ -166,3 +176,10 @@ class History(TimeStampMixin, Base):
         lazy="joined",
         cascade="all, delete",
     )
+
+
+class Occupancy(TimeStampMixin, Base):
+    """SQLAlchemy model representing the single-row 'occupancy' counter of parked cars."""
+
+    __tablename__ = "occupancy"
+    occupied: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
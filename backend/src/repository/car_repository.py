@@ -6,6 +6,8 @@ from sqlalchemy.exc import SQLAlchemyError
 # from backend.src.schemas.car_schema import CarCreate, CarUpdate
 from backend.src.schemas.car_schemas import CarSchema, CarUpdate
 from backend.src.entity.models import Car, User, user_car_association, History
+from backend.src.services.occupancy import occupancy_service
+from backend.src.services.plate_index import plate_index
 
 
 class CarRepository:
@@ -33,6 +35,7 @@ class CarRepository:
 
         await self.db.commit()
         await self.db.refresh(new_car)
+        plate_index.add(new_car.plate)
         new_car.user_ids = car_data.user_ids
         return new_car
 
@@ -115,18 +118,30 @@ class CarRepository:
 
         await self.db.commit()
         await self.db.refresh(car)
+        if car.plate != plate:
+            plate_index.rename(plate, car.plate)
         car.user_ids = [user.id for user in car.users]  # Записуємо ID користувачів
         return car
 
     async def delete_car(self, plate: str):
-        car = await self.db.execute(select(Car).where(Car.plate == plate))
+        # Блокування автомобіля, щоб одночасний в'їзд чи виїзд не змінив його відкриту сесію
+        car = await self.db.execute(select(Car).where(Car.plate == plate).with_for_update(of=Car))
         car = car.scalars().first()
 
         # Видалення зв'язків з користувачами
         await self.db.execute(delete(user_car_association).where(user_car_association.c.car_id == car.id))
 
+        # Відкриті сесії видаляються разом з автомобілем, тому лічильник зменшується в тій самій транзакції
+        open_sessions = await self.db.scalar(
+            select(func.count()).select_from(History)
+            .where(History.car_id == car.id, History.exit_time.is_(None))
+        )
+        if open_sessions:
+            await occupancy_service.change(self.db, -open_sessions)
+
         await self.db.delete(car)
         await self.db.commit()
+        plate_index.remove(car.plate)
         return
 
     async def ban_car(self, plate: str):
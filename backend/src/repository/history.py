@@ -1,54 +1,80 @@
 from datetime import datetime, timedelta, time
 
-from sqlalchemy import select, between, null, and_, desc, func, or_
+from fastapi import HTTPException
+from sqlalchemy import select, update, between, null, and_, desc, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, lazyload
 from backend.src.entity.models import History, ParkingRate, Car
-from typing import List, Sequence, Tuple
-from backend.src.repository.car_repository import CarRepository
+from typing import AsyncIterator, List, Sequence, Tuple
+from backend.src.services.occupancy import occupancy_service
+from backend.src.services.rate_timeline import rate_timeline
 import csv
+import io
+
+
+async def lock_car(plate: str, session: AsyncSession) -> int | None:
+    """
+    Lock the registered car with the given plate until the transaction ends.
+
+    Entries and exits of the same car (two cameras, a retried request) take this lock
+    first and the occupancy counter second, so they run one after another and never
+    deadlock with each other.
+
+    :param plate: The car plate.
+    :type plate: str
+    :param session: The database session.
+    :type session: AsyncSession
+    :return: The car id, or None if the plate is not registered.
+    :rtype: int | None
+    """
+    stmt = select(Car.id).where(Car.plate == plate).with_for_update()
+    return await session.scalar(stmt)
 
 
 async def create_exit(find_plate: str, picture_id: int, session: AsyncSession):
-    history_entries = await get_history_entries_with_null_exit_time(session)
-    number_free_spaces, rate_id = await update_parking_spaces(session)
-    number_free_spaces += 1
-    rate_id=int(rate_id)
     picture_id = int(picture_id)
 
     exit_time = datetime.now()
-    car_repository = CarRepository(session)
-    car_row = await car_repository.get_car_by_plate(find_plate)
-    if car_row:
-        for history in history_entries:
-            if history.car_id == car_row.id:
+    car_id = await lock_car(find_plate, session)
+    if car_id is not None:
+        history = await get_open_history_entry(car_id, session)
+        if history is None:
+            return None
+        number_free_spaces, rate_id = await occupancy_service.change(session, -1)
 
-                history.exit_time = exit_time
-                history.number_free_spaces = number_free_spaces
-                history.rate_id = rate_id
+        history.exit_time = exit_time
+        history.number_free_spaces = number_free_spaces
+        history.rate_id = rate_id
 
-                rate_per_hour, rate_per_day = await get_parking_rates_for_date(history.entry_time, session)
+        rate_per_hour, rate_per_day = await get_parking_rates_for_date(history.entry_time, session)
 
-                duration_hours = await calculate_parking_duration(history.entry_time, history.exit_time)
+        duration_hours = await calculate_parking_duration(history.entry_time, history.exit_time)
 
-                if duration_hours > 24:
-                    cost = await calculate_parking_cost(duration_hours, rate_per_day)
-                else:
-                    cost = await calculate_parking_cost(duration_hours, rate_per_hour)
+        if duration_hours > 24:
+            cost = await calculate_parking_cost(duration_hours, rate_per_day)
+        else:
+            cost = await calculate_parking_cost(duration_hours, rate_per_hour)
 
-                history.parking_time = duration_hours
-                history.cost = cost
+        history.parking_time = duration_hours
+        history.cost = cost
 
-                car_row.credit -= cost
-                session.add(car_row)
+        # Debit in the database: a read-modify-write in Python could lose a concurrent change of the balance
+        credit = await session.scalar(
+            update(Car)
+            .where(Car.id == car_id)
+            .values(credit=func.coalesce(Car.credit, 0) - cost)
+            .returning(Car.credit)
+        )
 
-                if car_row.credit >= 0:
-                    history.paid = True
+        if credit >= 0:
+            history.paid = True
 
-                await session.commit()
-                await session.refresh(history)
-                return history
+        await session.commit()
+        await session.refresh(history)
+        return history
     else:
+        # An unregistered car closes no open session, so the counter is only read
+        number_free_spaces, rate_id = await occupancy_service.change(session, 0)
         history_new = History(
             exit_time=exit_time, picture_id=picture_id, number_free_spaces=number_free_spaces,rate_id=rate_id)
         session.add(history_new)
@@ -56,21 +82,21 @@ async def create_exit(find_plate: str, picture_id: int, session: AsyncSession):
         await session.refresh(history_new)
         return history_new
 
-    return None
-
 
 async def create_entry(find_plate: str, picture_id: int, session: AsyncSession) -> History:
     entry_time = datetime.now()
-    number_free_spaces,rate_id = await update_parking_spaces(session)
-    number_free_spaces -= 1
-    
 
-    car_repository = CarRepository(session)
-    car_row = await car_repository.get_car_by_plate(find_plate)
+    car_id = await lock_car(find_plate, session)
     picture_id = int(picture_id)
-    if car_row:
-        car_id = car_row.id
-    else:
+    if car_id is not None:
+        history = await get_open_history_entry(car_id, session)
+        if history is not None:
+            # The car is already parked (repeated read or retried request): no second session is opened
+            await session.rollback()
+            raise HTTPException(status_code=409, detail=f"Car {find_plate} is already parked")
+
+    number_free_spaces, rate_id = await occupancy_service.change(session, 1)
+    if car_id is None:
 
         history_new = History(entry_time=entry_time, picture_id=picture_id,
                               number_free_spaces=number_free_spaces, rate_id=rate_id,
@@ -101,11 +127,7 @@ async def calculate_parking_cost(duration_hours: float, rate_per_hour: float) ->
 
 
 async def get_parking_rates_for_date(entry_time: datetime, session: AsyncSession) -> Tuple[float, float]:
-    rates = await session.execute(
-        select(ParkingRate).filter(ParkingRate.created_at <= entry_time)
-        .order_by(ParkingRate.created_at.desc()).limit(1)
-    )
-    rate_row = rates.scalars().first()
+    rate_row = await rate_timeline.rate_at(session, entry_time)
     if rate_row:
         return rate_row.rate_per_hour, rate_row.rate_per_day
     else:
@@ -122,6 +144,32 @@ async def get_history_entries_with_null_exit_time(session: AsyncSession) -> Sequ
     return history_entries
 
 
+async def get_open_history_entry(car_id: int, session: AsyncSession) -> History | None:
+    """
+    Return the open parking session (no exit time) of a car.
+
+    Served by the partial index ``ix_history_open_car_id``, so the cost does not depend on
+    how many cars are parked. Relationships are not eager-loaded: create_exit only updates
+    the row's own columns.
+
+    :param car_id: The car id.
+    :type car_id: int
+    :param session: The database session.
+    :type session: AsyncSession
+    :return: The latest open session of the car, or None.
+    :rtype: History | None
+    """
+    stmt = (
+        select(History)
+        .where(History.car_id == car_id, History.exit_time.is_(None))
+        .order_by(desc(History.entry_time))
+        .limit(1)
+        .options(lazyload("*"))
+    )
+    result = await session.execute(stmt)
+    return result.scalars().first()
+
+
 async def get_history_entries_by_period(start_time: datetime, end_time: datetime, session: AsyncSession) -> Sequence[History]:
 
     start_time = datetime.combine(start_time.date(), time.min)
@@ -167,33 +215,93 @@ def format_timedelta(td):
     minutes = remainder // 60
     return f"{days}d {hours}h {minutes}m"
 
-async def save_history_to_csv(history_entries: Sequence[History], file_path: str):
-    fieldnames = [
-        'entry_time',
-        'exit_time',
-        'parking_time',
-        'cost',
-        'paid',
-        'number_free_spaces',
-        'plate'
-    ]
+HISTORY_CSV_FIELDS = [
+    'entry_time',
+    'exit_time',
+    'parking_time',
+    'cost',
+    'paid',
+    'number_free_spaces',
+    'plate'
+]
+
+# Rows fetched from the server-side cursor and written as one CSV chunk
+HISTORY_CSV_CHUNK_ROWS = 500
+
+
+def history_csv_row(entry, plate: str) -> dict:
+    parking_duration = timedelta(hours=entry.parking_time) if entry.parking_time is not None else None
+    return {
+        'entry_time': entry.entry_time.strftime('%Y-%m-%d %H:%M') if entry.entry_time else None,
+        'exit_time': entry.exit_time.strftime('%Y-%m-%d %H:%M') if entry.exit_time else None,
+        'parking_time': format_timedelta(parking_duration) if parking_duration else None,
+        'cost': f"{entry.cost:.2f}" if entry.cost is not None else None,
+        'paid': entry.paid,
+        'number_free_spaces': entry.number_free_spaces,
+        'plate': plate
+    }
 
+
+async def save_history_to_csv(history_entries: Sequence[History], file_path: str):
     with open(file_path, mode='w', newline='') as file:
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
+        writer = csv.DictWriter(file, fieldnames=HISTORY_CSV_FIELDS)
         writer.writeheader()
         for entry in history_entries:
-            parking_duration = timedelta(hours=entry.parking_time) if entry.parking_time is not None else None
-            entry_dict = {
-                'entry_time': entry.entry_time.strftime('%Y-%m-%d %H:%M') if entry.entry_time else None,
-                'exit_time': entry.exit_time.strftime('%Y-%m-%d %H:%M') if entry.exit_time else None,
-                'parking_time': format_timedelta(parking_duration) if parking_duration else None,
-                'cost': f"{entry.cost:.2f}" if entry.cost is not None else None,
-                'paid': entry.paid,
-                'number_free_spaces': entry.number_free_spaces,
-                'plate': entry.car.plate
-            }
-            writer.writerow(entry_dict)
+            writer.writerow(history_csv_row(entry, entry.car.plate))
+
+
+async def stream_history_csv(start_time: datetime, end_time: datetime, session: AsyncSession,
+                             car_id: int = None) -> AsyncIterator[str]:
+    """
+    Yield the history of a period as CSV text, one chunk per batch of rows.
+
+    Only the exported columns and the car plate are selected, and rows are read from a
+    server-side cursor ``HISTORY_CSV_CHUNK_ROWS`` at a time, so memory use does not depend
+    on the length of the period.
+
+    :param start_time: First day of the period.
+    :type start_time: datetime
+    :param end_time: Last day of the period.
+    :type end_time: datetime
+    :param session: The database session; it must stay open until the iteration ends.
+    :type session: AsyncSession
+    :param car_id: Export only this car's history.
+    :type car_id: int
+    :return: CSV chunks, the first one starting with the header.
+    :rtype: AsyncIterator[str]
+    """
+    start_time = datetime.combine(start_time.date(), time.min)
+    end_time = datetime.combine(end_time.date(), time.max)
 
+    stmt = (
+        select(
+            History.entry_time,
+            History.exit_time,
+            History.parking_time,
+            History.cost,
+            History.paid,
+            History.number_free_spaces,
+            Car.plate,
+        )
+        .join(Car, History.car_id == Car.id)
+        .where(History.entry_time.between(start_time, end_time))
+        .order_by(History.entry_time)
+    )
+    if car_id is not None:
+        stmt = stmt.where(History.car_id == car_id)
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=HISTORY_CSV_FIELDS)
+    writer.writeheader()
+    result = await session.stream(stmt, execution_options={"yield_per": HISTORY_CSV_CHUNK_ROWS})
+    async for rows in result.partitions():
+        for row in rows:
+            writer.writerow(history_csv_row(row, row.plate))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
 
 
 async def get_history_entries_with_null_car_id(session: AsyncSession) -> Sequence[History]:
@@ -210,35 +318,9 @@ async def get_history_entries_with_null_paid(session: AsyncSession) -> Sequence[
     return history_entries
 
 
-async def update_parking_spaces(session: AsyncSession) -> Tuple[int, int]:
-    history_entries = await get_history_entries_with_null_exit_time(session)
-    num_entries = len(history_entries)
-
-    latest_parking_rate = await get_latest_parking_rate(session)
-    latest_parking_rate_spaces = latest_parking_rate.number_of_spaces if latest_parking_rate else 0
-
-    number_free_spaces = latest_parking_rate_spaces - num_entries
-
-    if number_free_spaces == 0:
-        number_free_spaces = 100
-    rate_id = latest_parking_rate.id if latest_parking_rate else 0
-    return number_free_spaces, latest_parking_rate.id
-
-
 async def get_latest_parking_rate(session: AsyncSession):
-    query = select(ParkingRate).order_by(desc(ParkingRate.created_at)).limit(1)
-    result = await session.execute(query)
-    parking_rate = result.unique().scalar_one_or_none()
-    return parking_rate
-
+    return await rate_timeline.latest(session)
 
-async def get_latest_parking_rate_with_free_spaces(session: AsyncSession):
-    query = select(History).order_by(desc(History.created_at)).limit(1)
-    result = await session.execute(query)
-    latest_entry = result.unique().scalar_one_or_none()
-    if latest_entry:
-        return f"free spaces -  {latest_entry.number_free_spaces}"
-    return "No data available"
 
 async def update_paid_history( plate: str,  paid: bool, session: AsyncSession):
     statement = select(History).where(
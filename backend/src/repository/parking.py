@@ -1,11 +1,12 @@
 from typing import Type
 
-from sqlalchemy import select, func, update, delete, between, DateTime, null
+from sqlalchemy import func, update, delete, between, DateTime, null
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.src import ParkingRate
 from backend.src.entity.models import ParkingRate
 from backend.src.schemas.parking_schema import ParkingRateSchema, NewParkingRateSchema, ParkingRateUpdate
+from backend.src.services.rate_timeline import rate_timeline
 
 
 async def create_rate(session: AsyncSession, rate_data: ParkingRateSchema) -> ParkingRate:
@@ -13,6 +14,7 @@ async def create_rate(session: AsyncSession, rate_data: ParkingRateSchema) -> Pa
     session.add(new_rate)
     await session.commit()
     await session.refresh(new_rate)
+    rate_timeline.invalidate()
     return new_rate
 
 #
@@ -30,20 +32,11 @@ async def create_rate(session: AsyncSession, rate_data: ParkingRateSchema) -> Pa
 
 
 async def get_default_rate_values(session: AsyncSession):
-    latest_rate = await session.execute(
-        select(ParkingRate)
-        .order_by(ParkingRate.created_at.desc())
-        .limit(1)
-    )
-    latest_rate = latest_rate.scalars().first()
-    return latest_rate
+    return await rate_timeline.latest(session)
 
 
 async def create_or_update_rate(session: AsyncSession, rate_data: NewParkingRateSchema) -> ParkingRate:
-    latest_rate = await session.execute(
-        select(ParkingRate).order_by(ParkingRate.created_at.desc()).limit(1)
-    )
-    latest_rate = latest_rate.scalars().first()
+    latest_rate = await rate_timeline.latest(session)
 
     new_rate_data = {
         "rate_per_hour": rate_data.rate_per_hour if rate_data.rate_per_hour is not None else (latest_rate.rate_per_hour if latest_rate else 10.0),
@@ -55,6 +48,7 @@ async def create_or_update_rate(session: AsyncSession, rate_data: NewParkingRate
     session.add(new_rate)
     await session.commit()
     await session.refresh(new_rate)
+    rate_timeline.invalidate()
     return new_rate
 
 
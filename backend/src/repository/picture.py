@@ -1,7 +1,7 @@
 import random
 from typing import Tuple
 
-from sqlalchemy import select
+from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.src.entity.models import Picture
@@ -21,3 +21,8 @@ async def create_picture(session: AsyncSession, find_plate: str, url: str, cloud
     await session.commit()
     await session.refresh(picture)
     return picture
+
+
+async def delete_picture(session: AsyncSession, picture_id: int):
+    await session.execute(delete(Picture).where(Picture.id == picture_id))
+    await session.commit()
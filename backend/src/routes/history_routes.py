@@ -1,11 +1,11 @@
 # backend/src/routes/history_routes.py
 from typing import List
 from datetime import datetime, timedelta
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.src.database.db import get_db
+from backend.src.database.db import get_db, sessionmanager
 from backend.src.repository import history as repositories_history
 from backend.src.schemas.history_schema import HistoryUpdatePaid, HistoryGet, HistoryUpdateCar, HistoryUpdate, \
     HistorySchema
@@ -16,6 +16,23 @@ from backend.src.repository.car_repository import CarRepository
 router = APIRouter(prefix="/history", tags=["history"])
 
 
+def history_csv_response(start_datetime: datetime, end_datetime: datetime, car_id: int = None) -> StreamingResponse:
+    """
+    Stream the history of a period as a CSV attachment.
+
+    The export opens its own database session: the request session is closed before
+    the response body is sent.
+    """
+    async def content():
+        async with sessionmanager.session() as session:
+            async for chunk in repositories_history.stream_history_csv(start_datetime, end_datetime, session, car_id):
+                yield chunk
+
+    filename = f"history_{start_datetime:%Y-%m-%d}_{end_datetime:%Y-%m-%d}.csv"
+    return StreamingResponse(content(), media_type="text/csv",
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
 @router.get("/create_entry/{find_plate}/{picture_id}", response_model=HistoryUpdate)
 async def create_entry(find_plate, picture_id, session: AsyncSession = Depends(get_db)):
     history = await repositories_history.create_entry(find_plate, picture_id, session)
@@ -93,11 +110,7 @@ async def get_history_entries_by_period_route(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Please use YYYY-MM-DD")
 
-    history_entries = await repositories_history.get_history_entries_by_period(start_datetime, end_datetime, session)
-    file_path = "backend/history_entries.csv"
-    await repositories_history.save_history_to_csv(history_entries, file_path)
-    # return history_entries
-    return FileResponse(file_path, filename="history_entries.csv", media_type="text/csv")
+    return history_csv_response(start_datetime, end_datetime)
 
 
 @router.get("/get_entries_by_period/{start_date}/{end_date}/{car_id}")
@@ -122,9 +135,4 @@ async def get_history_entries_for_car_by_period_route(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Please use YYYY-MM-DD")
 
-    history_entries = await repositories_history.get_history_entries_by_period_car(start_datetime, end_datetime, car_id,
-                                                                                   session)
-
-    file_path = "backend/history_entries.csv"
-    await repositories_history.save_history_to_csv(history_entries, file_path)
-    return FileResponse(file_path, filename="history_entries.csv", media_type="text/csv")
+    return history_csv_response(start_datetime, end_datetime, car_id)
@@ -1,34 +1,54 @@
 import logging
 
-import asynctempfile
 from fastapi import APIRouter, File, UploadFile, Form, HTTPException, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from DS.funcs_repo.image_process_async import plate_recognize
 from backend.src.database.db import get_db
-from backend.src.entity.models import User
+from backend.src.entity.models import User, Role
 from backend.src.repository.history import create_entry, create_exit
-from backend.src.repository.picture import create_picture
+from backend.src.repository.picture import create_picture, delete_picture
 from backend.src.services.auth import auth_service
 from backend.src.services.cloudstore import cloud_service
+from backend.src.services.plate_index import plate_index
+from backend.src.services.recognition import recognition_service
 
 router = APIRouter(prefix="/parking", tags=["parking"])
 
 
+async def read_plate(photo: UploadFile, camera_id: str | None, session: AsyncSession) -> tuple:
+    """
+    Recognize the plate on a gate photo and correct the read against the registered plates.
+
+    :param photo: Uploaded photo.
+    :type photo: UploadFile
+    :param camera_id: Camera profile to use, or None for the default profile.
+    :type camera_id: str | None
+    :param session: The database session.
+    :type session: AsyncSession
+    :return: Annotated image bytes and the plate (None if no plate was recognized).
+    :rtype: tuple
+    :raises HTTPException: 400 if the photo cannot be decoded or the camera is unknown.
+    """
+    try:
+        img_processed, recognized_symbols, confidence = await recognition_service.recognize(
+            await photo.read(), camera_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if recognized_symbols:
+        recognized_symbols = await plate_index.resolve(session, recognized_symbols, confidence)
+    return img_processed, recognized_symbols
+
+
 @router.post("/entry")
 async def park_entry(
         user: User = Depends(auth_service.get_current_user),
         photo: UploadFile = File(...),
         plate_number: str = Form(None),
+        camera_id: str = Form(None),
         session: AsyncSession = Depends(get_db)
 ) -> dict:
     # try:
-        
-    async with asynctempfile.NamedTemporaryFile(delete=False) as temp_file:
-        await temp_file.write(await photo.read())
-        file_path = temp_file.name
-
-    img_processed, recognized_symbols = await plate_recognize(file_path)
+    img_processed, recognized_symbols = await read_plate(photo, camera_id, session)
 
     if not recognized_symbols and not plate_number:
         raise HTTPException(status_code=400, detail="Номерний знак не розпізнано і не введено вручну")
@@ -37,7 +57,14 @@ async def park_entry(
     logging.info(img_url)
 
     picture = await create_picture(session, recognized_symbols or plate_number, img_url, cloudinary_public_id)
-    history = await create_entry(recognized_symbols or plate_number, picture.id, session)  # Виклик функції create_entry
+    picture_id = picture.id
+    try:
+        history = await create_entry(recognized_symbols or plate_number, picture_id, session)  # Виклик функції create_entry
+    except HTTPException:
+        # Автомобіль уже на парковці (409): фото не належить жодному запису історії, тож видаляється
+        await delete_picture(session, picture_id)
+        await cloud_service.delete_picture(cloudinary_public_id)
+        raise
     return {"message": "Welcome to Cars Home!", "image_url": img_url, "plate_number": recognized_symbols or plate_number}
     # #TODO create scheme
     # except Exception as e:
@@ -49,15 +76,12 @@ async def park_exit(
         user: User = Depends(auth_service.get_current_user),
         photo: UploadFile = File(...),
         plate_number: str = Form(None),
+        camera_id: str = Form(None),
         session: AsyncSession = Depends(get_db)
 ) -> dict:
 
     # try:
-    async with asynctempfile.NamedTemporaryFile(delete=False) as temp_file:
-        await temp_file.write(await photo.read())
-        file_path = temp_file.name
-
-    img_processed, recognized_symbols = await plate_recognize(file_path)
+    img_processed, recognized_symbols = await read_plate(photo, camera_id, session)
 
     if not recognized_symbols and not plate_number:
         raise HTTPException(status_code=400, detail="Номерний знак не розпізнано і не введено вручну")
@@ -71,3 +95,10 @@ async def park_exit(
 
     # except Exception as e:
     #     raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/metrics")
+async def recognition_metrics(admin: User = Depends(auth_service.get_current_admin)) -> dict:
+    if admin.role != Role.admin:
+        raise HTTPException(status_code=400, detail="Not authorized to access this resource")
+    return {"stages": recognition_service.metrics.snapshot(), "cache": recognition_service.cache.stats()}
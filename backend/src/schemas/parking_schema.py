@@ -27,3 +27,12 @@ class ParkingRateSchema(BaseModel):
     rate_per_day: float
     number_of_spaces: int = Field(default=100, nullable=True)
 
+
+
+class FreeSpacesSchema(BaseModel):
+    """Pydantic model for serializing the current occupancy of the parking lot."""
+    number_of_spaces: int
+    occupied: int
+    free_spaces: int
+    rate_per_hour: float
+    rate_per_day: float
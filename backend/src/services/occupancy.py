@@ -0,0 +1,122 @@
+from typing import Tuple
+
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.src.entity.models import History, Occupancy, ParkingRate
+from backend.src.services.rate_timeline import RateEntry, rate_timeline
+
+
+class OccupancyService:
+    """
+    Number of parked cars kept in the single-row ``occupancy`` table.
+
+    The counter equals the number of history rows without an exit time. Entries and exits
+    change it with ``UPDATE ... RETURNING`` in the same transaction as the history row they
+    write, so it is never out of step with a committed entry or exit, and concurrent gates
+    serialize on the counter row instead of counting the history table.
+    """
+
+    row_id = 1
+
+    async def _latest_rate(self, session: AsyncSession) -> RateEntry | None:
+        return await rate_timeline.latest(session)
+
+    async def _count_open(self, session: AsyncSession) -> int:
+        stmt = select(func.count()).select_from(History).where(History.exit_time.is_(None))
+        return await session.scalar(stmt)
+
+    async def resync(self, session: AsyncSession) -> int:
+        """
+        Reset the counter to the number of open history rows and commit.
+
+        Run at startup: it repairs the counter after history rows were edited outside
+        the application. The counter row is locked before counting, so an entry or exit
+        committed meanwhile is either counted or waits and is applied on top.
+
+        :param session: The database session.
+        :type session: AsyncSession
+        :return: Number of parked cars.
+        :rtype: int
+        """
+        seed = insert(Occupancy).values(id=self.row_id, occupied=0)
+        await session.execute(seed.on_conflict_do_nothing(index_elements=[Occupancy.id]))
+        await session.execute(select(Occupancy.id).where(Occupancy.id == self.row_id).with_for_update())
+        occupied = await self._count_open(session)
+        await session.execute(
+            update(Occupancy)
+            .where(Occupancy.id == self.row_id)
+            .values(occupied=occupied, updated_at=func.now())
+        )
+        await session.commit()
+        return occupied
+
+    async def occupied(self, session: AsyncSession) -> int:
+        """
+        Current number of parked cars.
+
+        :param session: The database session.
+        :type session: AsyncSession
+        :return: Number of parked cars.
+        :rtype: int
+        """
+        occupied = await session.scalar(select(Occupancy.occupied).where(Occupancy.id == self.row_id))
+        if occupied is None:
+            occupied = await self._count_open(session)
+        return occupied
+
+    async def change(self, session: AsyncSession, delta: int) -> Tuple[int, int | None]:
+        """
+        Add ``delta`` parked cars without committing; the caller commits it together
+        with the history row of the entry or exit.
+
+        :param session: The database session.
+        :type session: AsyncSession
+        :param delta: 1 for an entry, -1 for a closed parking session, 0 to only read.
+        :type delta: int
+        :return: Free spaces after the change and the id of the current parking rate.
+        :rtype: Tuple[int, int | None]
+        """
+        if delta:
+            stmt = (
+                update(Occupancy)
+                .where(Occupancy.id == self.row_id)
+                .values(occupied=Occupancy.occupied + delta, updated_at=func.now())
+                .returning(Occupancy.occupied)
+            )
+            occupied = await session.scalar(stmt)
+            if occupied is None:
+                # The counter row is created by the migration; seed it if the table was emptied
+                seed = insert(Occupancy).values(id=self.row_id, occupied=await self._count_open(session))
+                await session.execute(seed.on_conflict_do_nothing(index_elements=[Occupancy.id]))
+                occupied = await session.scalar(stmt)
+        else:
+            occupied = await self.occupied(session)
+
+        rate = await self._latest_rate(session)
+        capacity = rate.number_of_spaces if rate else ParkingRate.number_of_spaces.default.arg
+        return max(capacity - occupied, 0), rate.id if rate else None
+
+    async def free_spaces(self, session: AsyncSession) -> dict:
+        """
+        Occupancy of the parking lot.
+
+        :param session: The database session.
+        :type session: AsyncSession
+        :return: Capacity, parked cars, free spaces and current rates.
+        :rtype: dict
+        """
+        occupied = await self.occupied(session)
+        rate = await self._latest_rate(session)
+        capacity = rate.number_of_spaces if rate else ParkingRate.number_of_spaces.default.arg
+        return {
+            "number_of_spaces": capacity,
+            "occupied": occupied,
+            "free_spaces": max(capacity - occupied, 0),
+            "rate_per_hour": rate.rate_per_hour if rate else ParkingRate.rate_per_hour.default.arg,
+            "rate_per_day": rate.rate_per_day if rate else ParkingRate.rate_per_day.default.arg,
+        }
+
+
+occupancy_service = OccupancyService()
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from DS.funcs_repo.plate_grammar import DeletionIndex, apply_grammar, is_valid_plate, normalize_plate
+
+from backend.src.conf.config import config
+from backend.src.entity.models import Car
+
+
+class PlateIndex:
+    """
+    In-memory index of registered plates used to correct OCR reads.
+
+    Plates are loaded from the ``cars`` table on first use and kept up to date by
+    CarRepository on create/update/delete, so a lookup never queries the database.
+    A low-confidence read is first fixed with the plate-format rules (digit/letter
+    look-alikes) and then snapped to the nearest registered plate within
+    ``max_distance`` edits, found with a deletion-neighbourhood index: a handful of
+    dictionary lookups regardless of the number of registered plates.
+    """
+
+    def __init__(self, max_distance: int = config.ALPR_CORRECTION_MAX_DISTANCE,
+                 max_confidence: float = config.ALPR_CORRECTION_CONFIDENCE):
+        self.max_distance = max_distance
+        self.max_confidence = max_confidence
+        self._plates = {}
+        self._index = DeletionIndex(max_distance=max_distance)
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def rebuild(self, plates):
+        """
+        Replace the index content.
+
+        :param plates: Registered plates as stored in the database.
+        :type plates: Iterable[str]
+        """
+        self._plates = {normalize_plate(plate): plate for plate in plates}
+        self._index = DeletionIndex(self._plates, max_distance=self.max_distance)
+        self._loaded = True
+
+    async def ensure_loaded(self, session: AsyncSession):
+        """
+        Load registered plates from the database if the index is empty.
+
+        :param session: The database session.
+        :type session: AsyncSession
+        """
+        if self._loaded:
+            return
+        async with self._lock:
+            if not self._loaded:
+                result = await session.execute(select(Car.plate))
+                self.rebuild(result.scalars().all())
+
+    def add(self, plate: str):
+        """
+        Register a plate. Ignored until the index is loaded: the next load reads it from the database.
+
+        :param plate: Plate as stored in the database.
+        :type plate: str
+        """
+        if self._loaded:
+            key = normalize_plate(plate)
+            self._plates[key] = plate
+            self._index.add(key)
+
+    def remove(self, plate: str):
+        """
+        Unregister a plate.
+
+        :param plate: Plate as stored in the database.
+        :type plate: str
+        """
+        key = normalize_plate(plate)
+        self._plates.pop(key, None)
+        self._index.discard(key)
+
+    def rename(self, old_plate: str, new_plate: str):
+        """
+        Replace a registered plate after a car update.
+        """
+        self.remove(old_plate)
+        self.add(new_plate)
+
+    def lookup(self, plate: str) -> str | None:
+        """
+        Return the registered plate equal to ``plate`` after normalisation, if any.
+        """
+        return self._plates.get(normalize_plate(plate))
+
+    def nearest(self, plate: str, max_distance: int = None) -> list:
+        """
+        Registered plates within ``max_distance`` edits of ``plate``.
+
+        :return: (distance, registered plate) pairs sorted by distance.
+        :rtype: list
+        """
+        return [(distance, self._plates[key])
+                for distance, key in self._index.search(normalize_plate(plate), max_distance)]
+
+    def correct(self, plate: str, confidence: float = None) -> str:
+        """
+        Correct an OCR read against the registered plates.
+
+        Reads with confidence at or above ``max_confidence`` are trusted, so a visitor whose
+        plate differs from a registered one by a single character is not billed to that car.
+        A read is snapped to a registered plate only when exactly one plate is nearest.
+
+        :param plate: Recognized plate.
+        :type plate: str
+        :param confidence: Calibrated confidence of the read.
+        :type confidence: float
+        :return: Registered plate, the format-corrected read, or the read unchanged.
+        :rtype: str
+        """
+        registered = self.lookup(plate)
+        if registered is not None:
+            return registered
+        if confidence is not None and confidence >= self.max_confidence:
+            return plate
+        candidate = apply_grammar(normalize_plate(plate))
+        matches = self.nearest(candidate)
+        if matches and (len(matches) == 1 or matches[0][0] < matches[1][0]):
+            return matches[0][1]
+        return candidate if is_valid_plate(candidate) else plate
+
+    async def resolve(self, session: AsyncSession, plate: str, confidence: float = None) -> str:
+        """
+        Load the index if needed and correct an OCR read.
+
+        :param session: The database session.
+        :type session: AsyncSession
+        :param plate: Recognized plate.
+        :type plate: str
+        :param confidence: Calibrated confidence of the read.
+        :type confidence: float
+        :return: Corrected plate.
+        :rtype: str
+        """
+        await self.ensure_loaded(session)
+        corrected = self.correct(plate, confidence)
+        if corrected != plate:
+            logging.info(f"Plate read {plate} (confidence {confidence}) corrected to {corrected}")
+        return corrected
+
+
+plate_index = PlateIndex()
@@ -0,0 +1,115 @@
+import asyncio
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.src.conf.config import config
+from backend.src.entity.models import ParkingRate
+
+
+@dataclass(frozen=True)
+class RateEntry:
+    """A parking rate valid from ``created_at`` until the next rate."""
+
+    id: int
+    created_at: datetime
+    rate_per_hour: float
+    rate_per_day: float
+    number_of_spaces: int
+
+
+class RateTimeline:
+    """
+    In-process copy of the ``parking_rates`` table sorted by ``created_at``.
+
+    Billing an exit needs the rate valid at the entry time; it is found by binary search
+    over the cached timeline, so no rate query runs per request. The timeline is reloaded
+    after a rate is written through the API and, to pick up rates written by other
+    processes, at most ``ttl_seconds`` after the last load.
+    """
+
+    def __init__(self, ttl_seconds: float = config.RATE_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._times = []
+        self._rates = []
+        self._loaded_at = None
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        """
+        Drop the cached timeline; the next lookup reloads it.
+
+        Bumping the generation also discards a load that is running right now: its rows
+        may predate the write that caused the invalidation.
+        """
+        self._generation += 1
+        self._loaded_at = None
+
+    def _expired(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds
+
+    async def ensure_loaded(self, session: AsyncSession):
+        """
+        Load the rates from the database if the timeline is empty or expired.
+
+        Columns are selected directly: loading ParkingRate entities would eager-load their history.
+
+        :param session: The database session.
+        :type session: AsyncSession
+        """
+        if not self._expired():
+            return
+        async with self._lock:
+            if self._expired():
+                generation = self._generation
+                result = await session.execute(
+                    select(
+                        ParkingRate.id,
+                        ParkingRate.created_at,
+                        ParkingRate.rate_per_hour,
+                        ParkingRate.rate_per_day,
+                        ParkingRate.number_of_spaces,
+                    )
+                    .where(ParkingRate.created_at.is_not(None))
+                    .order_by(ParkingRate.created_at, ParkingRate.id)
+                )
+                self._rates = [RateEntry(*row) for row in result.all()]
+                self._times = [rate.created_at for rate in self._rates]
+                # Invalidated while loading: use the rows for this lookup, but reload on the next one
+                if generation == self._generation:
+                    self._loaded_at = time.monotonic()
+
+    async def rate_at(self, session: AsyncSession, moment: datetime) -> RateEntry | None:
+        """
+        The rate valid at ``moment``: the latest one created at or before it.
+
+        :param session: The database session.
+        :type session: AsyncSession
+        :param moment: Point in time, e.g. the entry time of a parking session.
+        :type moment: datetime
+        :return: The rate, or None if no rate was created before ``moment``.
+        :rtype: RateEntry | None
+        """
+        await self.ensure_loaded(session)
+        index = bisect_right(self._times, moment)
+        return self._rates[index - 1] if index else None
+
+    async def latest(self, session: AsyncSession) -> RateEntry | None:
+        """
+        The most recently created rate.
+
+        :param session: The database session.
+        :type session: AsyncSession
+        :return: The rate, or None if there are no rates.
+        :rtype: RateEntry | None
+        """
+        await self.ensure_loaded(session)
+        return self._rates[-1] if self._rates else None
+
+
+rate_timeline = RateTimeline()
@@ -0,0 +1,22 @@
+from DS.funcs_repo.recognition_executor import RecognitionExecutor
+
+from backend.src.conf.config import config
+
+
+recognition_service = RecognitionExecutor(
+    max_workers=config.ALPR_WORKERS,
+    backend=config.ALPR_BACKEND,
+    mode=config.ALPR_RECOGNITION_MODE,
+    camera_profiles=config.ALPR_CAMERA_PROFILES,
+    batch_max_size=config.ALPR_BATCH_MAX_SIZE,
+    batch_max_wait_ms=config.ALPR_BATCH_MAX_WAIT_MS,
+    batch_response_timeout=config.ALPR_BATCH_RESPONSE_TIMEOUT,
+    warmup_runs=config.ALPR_WARMUP_RUNS,
+    cache_size=config.ALPR_CACHE_SIZE,
+    cache_ttl_seconds=config.ALPR_CACHE_TTL_SECONDS,
+    cache_max_distance=config.ALPR_CACHE_MAX_DISTANCE,
+    output_format=config.ALPR_OUTPUT_FORMAT,
+    output_quality=config.ALPR_OUTPUT_QUALITY,
+    output_max_size=config.ALPR_OUTPUT_MAX_SIZE,
+    output_crop=config.ALPR_OUTPUT_CROP,
+)
@@ -0,0 +1,58 @@
+"""
+Parity of the exported character classifiers with the Keras model.
+
+Every backend must predict the same class as Keras for each validation crop in
+DS/data.zip, with probabilities within ATOL. A backend is skipped when its runtime
+or model file is not installed.
+"""
+import importlib.util
+import os
+
+import numpy as np
+import pytest
+
+from DS.funcs_repo.configures import MODEL, MODEL_TFLITE, MODEL_ONNX
+from DS.funcs_repo.datasets import CHARACTER_DATA, load_character_batch
+from DS.funcs_repo.inference_backend import load_backend
+
+ATOL = 1e-4
+
+RUNTIMES = {
+    'tflite': (('tflite_runtime', 'tensorflow'), MODEL_TFLITE),
+    'onnx': (('onnxruntime',), MODEL_ONNX),
+}
+
+
+def _installed(*modules) -> bool:
+    return any(importlib.util.find_spec(module) is not None for module in modules)
+
+
+@pytest.fixture(scope="module")
+def validation_batch():
+    if not os.path.exists(CHARACTER_DATA):
+        pytest.skip(f"{CHARACTER_DATA} not found")
+    return load_character_batch(CHARACTER_DATA, split='val')
+
+
+@pytest.fixture(scope="module")
+def keras_reference(validation_batch):
+    if not _installed('keras') or not os.path.exists(MODEL):
+        pytest.skip("Keras or the Keras model is not installed")
+    batch, _ = validation_batch
+    return load_backend('keras').predict_on_batch(batch)
+
+
+@pytest.mark.parametrize("name", list(RUNTIMES))
+def test_backend_matches_keras(name, validation_batch, keras_reference):
+    modules, path = RUNTIMES[name]
+    if not _installed(*modules):
+        pytest.skip(f"{name} runtime is not installed")
+    if not os.path.exists(path):
+        pytest.skip(f"{path} not found, run python -m DS.funcs_repo.convert_model")
+
+    batch, _ = validation_batch
+    y_proba = load_backend(name).predict_on_batch(batch)
+
+    assert y_proba.shape == keras_reference.shape
+    np.testing.assert_array_equal(y_proba.argmax(axis=1), keras_reference.argmax(axis=1))
+    np.testing.assert_allclose(y_proba, keras_reference, rtol=0, atol=ATOL)
@@ -0,0 +1,77 @@
+"""
+Gate entry route: a car that is already parked.
+
+The route is called directly with recognition, storage and the repository replaced, so
+the test needs neither a database nor Cloudinary.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from backend.src.routes import picture_routes
+
+PLATE = "KA7777CA"
+PICTURE_ID = 7
+PUBLIC_ID = "Entry_photos/abc"
+
+
+@pytest.fixture
+def gate(monkeypatch):
+    """
+    Replace everything park_entry calls and record what it deletes.
+    """
+    calls = {"deleted_rows": [], "deleted_images": [], "entries": []}
+
+    async def read_plate(photo, camera_id, session):
+        return b"image", PLATE
+
+    async def upload_picture(image, folder):
+        return "https://example.com/abc.png", PUBLIC_ID
+
+    async def delete_image(public_id):
+        calls["deleted_images"].append(public_id)
+
+    async def create_picture(session, plate, url, public_id):
+        return SimpleNamespace(id=PICTURE_ID)
+
+    async def delete_picture(session, picture_id):
+        calls["deleted_rows"].append(picture_id)
+
+    monkeypatch.setattr(picture_routes, "read_plate", read_plate)
+    monkeypatch.setattr(picture_routes, "create_picture", create_picture)
+    monkeypatch.setattr(picture_routes, "delete_picture", delete_picture)
+    monkeypatch.setattr(picture_routes.cloud_service, "upload_picture", upload_picture)
+    monkeypatch.setattr(picture_routes.cloud_service, "delete_picture", delete_image)
+    return calls
+
+
+def _park_entry():
+    return asyncio.run(picture_routes.park_entry(user=None, photo=None, plate_number=None, camera_id=None,
+                                                 session=None))
+
+
+def test_repeated_entry_returns_409_and_removes_the_unlinked_picture(gate, monkeypatch):
+    async def create_entry(plate, picture_id, session):
+        raise HTTPException(status_code=409, detail=f"Car {plate} is already parked")
+
+    monkeypatch.setattr(picture_routes, "create_entry", create_entry)
+
+    with pytest.raises(HTTPException) as conflict:
+        _park_entry()
+    assert conflict.value.status_code == 409
+    assert gate["deleted_rows"] == [PICTURE_ID]
+    assert gate["deleted_images"] == [PUBLIC_ID]
+
+
+def test_new_entry_keeps_the_picture(gate, monkeypatch):
+    async def create_entry(plate, picture_id, session):
+        gate["entries"].append((plate, picture_id))
+
+    monkeypatch.setattr(picture_routes, "create_entry", create_entry)
+
+    response = _park_entry()
+    assert response["plate_number"] == PLATE
+    assert gate["entries"] == [(PLATE, PICTURE_ID)]
+    assert gate["deleted_rows"] == [] and gate["deleted_images"] == []
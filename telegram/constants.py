@@ -16,7 +16,7 @@ USR_COMMANDS = {
     "free": {
         "name": "Вільні місця",
         "description": "Кількість вільних місць",
-        "url": "/api/admin/default-parking-rate",
+        "url": "/api/parking-rate/free-spaces",
     },
     "history": {
         "name": "Історія",
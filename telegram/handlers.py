@@ -67,7 +67,7 @@ async def free(message: Message, command: CommandObject):
     response = await do_get(message, url, access_token.get("access_token"))
     if response:
         await message.answer(
-            f"<b>{response.get('number_of_spaces')} вільних місць\n\n"
+            f"<b>{response.get('free_spaces')} з {response.get('number_of_spaces')} вільних місць\n\n"
             f"Тарифи:</b>\n{response.get('rate_per_hour')}/год.\n"
             f"{response.get('rate_per_day')*24}/добу"
         )